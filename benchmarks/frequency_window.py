@@ -0,0 +1,86 @@
+#
+# Compare the per-insert cost of the ring-buffer FrequencyWindowManager
+# against the original sorted linked-list window across window sizes. Each
+# window is prefilled to capacity (in ascending order, which is the linked
+# list's cheapest case) and then timed over random inserts that each also evict
+# a sample. Run from the package root with the workspace sourced:
+#
+#     python3 -m benchmarks.frequency_window
+#
+
+from queue import Queue
+from random import Random
+from time import perf_counter
+
+from scripts.DoublyLinkedList import DoublyLinkedList
+from scripts.FollowHubSubpage import FrequencyWindowManager
+
+#
+# Constants
+#
+
+WINDOW_LENGTHS = (450, 1000, 10000, 100000)
+TIMED_INSERTS = 2000
+
+#
+# Class definitions
+#
+
+## The original sorted linked-list frequency window, kept as a baseline.
+class LinkedListFrequencyWindow(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param window_length The max number of samples in the window.
+    def __init__(self, window_length):
+        self.window_length = window_length
+        self.ll = DoublyLinkedList()
+        self.queue = Queue()
+        self.queue_size = 0
+
+    ## Insert a value into the frequency window.
+    #  @param self The object pointer.
+    #  @param value The frequency to insert into the sliding window.
+    def insert(self, value):
+        while self.queue_size >= self.window_length:
+            self.ll.remove(self.queue.get())
+            self.queue.task_done()
+            self.queue_size -= 1
+        self.queue.put(self.ll.insert(value))
+        self.queue_size += 1
+
+    ## Helper function to get the current min and max frequencies of the window.
+    #  @param self The object pointer.
+    #  @return A tuple of the (min,max) frequency.
+    def get_mm(self):
+        return self.ll.lmin.parent.value, self.ll.lmax.child.value
+
+#
+# Global functions
+#
+
+## Time inserting and querying random samples into a full window.
+#  @param window The window to benchmark.
+#  @param window_length The max number of samples in the window.
+#  @return The mean time per insert and query, in microseconds.
+def time_window(window, window_length):
+    for i in range(window_length):
+        window.insert(float(i))
+    rng = Random(0)
+    samples = [rng.uniform(0, window_length) for _ in range(TIMED_INSERTS)]
+    start = perf_counter()
+    for sample in samples:
+        window.insert(sample)
+        window.get_mm()
+    return 1000000 * (perf_counter() - start) / TIMED_INSERTS
+
+## Run the benchmark and print a table of the results.
+def main():
+    print("{0:>10} {1:>16} {2:>16} {3:>10}".format("window", "linked_list_us", "ring_us", "speedup"))
+    for window_length in WINDOW_LENGTHS:
+        ll_us = time_window(LinkedListFrequencyWindow(window_length), window_length)
+        ring_us = time_window(FrequencyWindowManager(window_length), window_length)
+        print("{0:>10} {1:>16.2f} {2:>16.2f} {3:>9.1f}x".format(window_length, ll_us, ring_us, ll_us / ring_us))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#
+# Measure the per-frame cost and number of buffer copies of converting a ROS
+# Image msg to a QPixmap, comparing the original CvBridge path with the direct
+# buffer-wrapping path in GuiUtils, for each supported encoding. A stage counts
+# as a copy when its output does not share the memory of its input. Run from
+# the package root with the workspace sourced:
+#
+#     QT_QPA_PLATFORM=offscreen python3 -m benchmarks.rosimg_conversion
+#
+
+from sys import argv as sargs
+from time import perf_counter
+
+import numpy as np
+
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+from sensor_msgs.msg import Image
+
+from scripts import GuiUtils
+
+#
+# Constants
+#
+
+WIDTH = 640
+HEIGHT = 480
+FRAMES = 500
+ENCODING_CHANNEL_BYTES = {
+    "rgb8": 3,
+    "bgr8": 3,
+    "bgra8": 4,
+    "mono8": 1,
+    "mono16": 2,
+}
+
+#
+# Global functions
+#
+
+## Build a ROS image msg of random pixels.
+#  @param encoding The ROS image encoding.
+#  @return The ROS image msg.
+def make_image(encoding):
+    step = WIDTH * ENCODING_CHANNEL_BYTES[encoding]
+    msg = Image(encoding=encoding, width=WIDTH, height=HEIGHT, step=step)
+    msg.data = np.random.randint(0, 256, step * HEIGHT, dtype=np.uint8).tobytes()
+    return msg
+
+## Get the address of the first byte of a msg's data buffer.
+#  @param msg The ROS image msg.
+#  @return The address.
+def data_address(msg):
+    return np.frombuffer(msg.data, dtype=np.uint8).ctypes.data
+
+## The original conversion path, kept as a baseline.
+#  @param msg The ROS image msg.
+#  @return A tuple of the QPixmap and number of copies made before the upload.
+def convert_cv_bridge(msg):
+    img_cv = GuiUtils.CV_BRIDGE.imgmsg_to_cv2(msg, desired_encoding="bgr8")
+    copies = 0 if (img_cv.ctypes.data == data_address(msg)) else 1
+    h, w, _ = img_cv.shape
+    return QPixmap.fromImage(QImage(img_cv.data, w, h, 3*w, QImage.Format_BGR888)), copies
+
+## The direct buffer-wrapping path.
+#  @param msg The ROS image msg.
+#  @return A tuple of the QPixmap and number of copies made before the upload.
+def convert_direct(msg):
+    qimg = GuiUtils.get_qimage_from_rosimg(msg)
+    copies = 0 if (int(qimg.constBits()) == data_address(msg)) else 1
+    return QPixmap.fromImage(qimg), copies
+
+## Time a conversion path over a number of frames.
+#  @param msg The ROS image msg.
+#  @param convert The conversion function.
+#  @return A tuple of the mean time per frame, in milliseconds, and the number
+#  of copies per frame, including the QPixmap upload.
+def time_conversion(msg, convert):
+    _, copies = convert(msg)
+    start = perf_counter()
+    for _ in range(FRAMES):
+        convert(msg)
+    return 1000 * (perf_counter() - start) / FRAMES, copies + 1
+
+## Run the benchmark and print a table of the results.
+def main():
+    app = QApplication(sargs)
+    print("{0:>8} {1:>14} {2:>14} {3:>14} {4:>14}".format(
+        "encoding", "cv_bridge_ms", "cv_bridge_copy", "direct_ms", "direct_copy"
+    ))
+    for encoding in ENCODING_CHANNEL_BYTES:
+        msg = make_image(encoding)
+        cv_ms, cv_copies = time_conversion(msg, convert_cv_bridge)
+        direct_ms, direct_copies = time_conversion(msg, convert_direct)
+        print("{0:>8} {1:>14.3f} {2:>14} {3:>14.3f} {4:>14}".format(
+            encoding, cv_ms, cv_copies, direct_ms, direct_copies
+        ))
+
+if __name__ == "__main__":
+    main()
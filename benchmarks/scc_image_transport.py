@@ -0,0 +1,148 @@
+#
+# A local stand-in for the screen color coordination node's preview stream,
+# for comparing raw and compressed image transport. By default, synthetic
+# frames are published as a raw sensor_msgs/Image and as JPEG and PNG
+# sensor_msgs/CompressedImage on private topics, received in-process, and the
+# serialized size and end-to-end latency (publish, transport, and decode into a
+# QImage as the GUI would) are reported for each. With --serve, frames are
+# instead published at 30 Hz on the GUI's own topics, as empty-image color
+# peaks telemetry plus a JPEG stream, to drive a GUI running with
+# scc_image_transport set to "compressed". Run from the package root with the
+# workspace sourced:
+#
+#     python3 -m benchmarks.scc_image_transport [--serve]
+#
+
+from sys import argv as sargs
+from time import perf_counter, sleep
+from statistics import median
+
+import cv2
+import numpy as np
+
+import rclpy
+from rclpy.node import Node
+from rclpy.serialization import serialize_message
+
+import sh_common_constants
+from sensor_msgs.msg import CompressedImage, Image
+from sh_scc_interfaces.msg import ColorPeaksTelem
+
+from scripts import GuiUtils
+
+#
+# Constants
+#
+
+WIDTH = 640
+HEIGHT = 480
+FRAMES = 200
+SERVE_PERIOD_S = 1 / 30
+JPEG_QUALITY = 80
+
+#
+# Global functions
+#
+
+## Build a synthetic BGR frame that changes over time.
+#  @param n The frame number.
+#  @return The (HEIGHT,WIDTH,3) uint8 array.
+def make_frame(n):
+    x = np.linspace(0, 255, WIDTH, dtype=np.float32)
+    y = np.linspace(0, 255, HEIGHT, dtype=np.float32)[:, np.newaxis]
+    frame = np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frame[:, :, 0] = (x + n) % 256
+    frame[:, :, 1] = (y + (2 * n)) % 256
+    frame[:, :, 2] = ((x + y) / 2 + (3 * n)) % 256
+    return frame
+
+## Build a raw ROS image msg from a frame.
+#  @param frame The BGR frame.
+#  @param n The frame number, stored in the header.
+#  @return The ROS image msg.
+def make_raw(frame, n):
+    msg = Image(encoding="bgr8", width=WIDTH, height=HEIGHT, step=3 * WIDTH)
+    msg.header.frame_id = str(n)
+    msg.data = frame.tobytes()
+    return msg
+
+## Build a compressed ROS image msg from a frame.
+#  @param frame The BGR frame.
+#  @param n The frame number, stored in the header.
+#  @param fmt Either "jpeg" or "png".
+#  @return The ROS compressed image msg.
+def make_compressed(frame, n, fmt):
+    params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY] if ("jpeg" == fmt) else []
+    ok, encoded = cv2.imencode(".jpg" if ("jpeg" == fmt) else ".png", frame, params)
+    assert ok, "Failed to encode frame as {0}".format(fmt)
+    msg = CompressedImage(format=fmt)
+    msg.header.frame_id = str(n)
+    msg.data = encoded.tobytes()
+    return msg
+
+## Publish frames over one transport and measure them on receipt.
+#  @param node The ROS node.
+#  @param msg_type The ROS msg type of the transport.
+#  @param make_msg A function building the msg for a frame and frame number.
+#  @return A tuple of the median serialized size, in bytes, and median latency, in milliseconds.
+def measure(node, msg_type, make_msg):
+    topic = "/scc_image_transport_benchmark/{0}".format(msg_type.__name__.lower())
+    sent = {}
+    sizes = []
+    latencies = []
+    def callback(msg):
+        GuiUtils.get_scaled_qimage_from_rosimg(msg, None)
+        latencies.append(1000 * (perf_counter() - sent.pop(msg.header.frame_id)))
+    pub = node.create_publisher(msg_type, topic, 1)
+    sub = node.create_subscription(msg_type, topic, callback, 1)
+    for _ in range(20):
+        rclpy.spin_once(node, timeout_sec=0.01)
+    for n in range(FRAMES):
+        msg = make_msg(make_frame(n), n)
+        sizes.append(len(serialize_message(msg)))
+        sent[msg.header.frame_id] = perf_counter()
+        pub.publish(msg)
+        while msg.header.frame_id in sent:
+            rclpy.spin_once(node, timeout_sec=0.1)
+    node.destroy_subscription(sub)
+    node.destroy_publisher(pub)
+    return median(sizes), median(latencies)
+
+## Publish synthetic telemetry and a compressed stream on the GUI's topics forever.
+#  @param node The ROS node.
+def serve(node):
+    telem_pub = node.create_publisher(ColorPeaksTelem, sh_common_constants.topics.COLOR_PEAKS_TELEM, 1)
+    image_pub = node.create_publisher(
+        CompressedImage,
+        sh_common_constants.topics.COLOR_PEAKS_TELEM + "/image/compressed",
+        1
+    )
+    n = 0
+    while rclpy.ok():
+        telem_pub.publish(ColorPeaksTelem())
+        image_pub.publish(make_compressed(make_frame(n), n, "jpeg"))
+        n += 1
+        sleep(SERVE_PERIOD_S)
+
+## Run the benchmark, or the stand-in publisher, and print the results.
+def main():
+    rclpy.init()
+    node = Node("scc_image_transport_benchmark")
+    try:
+        if "--serve" in sargs:
+            serve(node)
+            return
+        print("{0:>10} {1:>12} {2:>12}".format("transport", "bytes", "latency_ms"))
+        for name, msg_type, make_msg in (
+            ("raw", Image, make_raw),
+            ("jpeg", CompressedImage, lambda frame, n: make_compressed(frame, n, "jpeg")),
+            ("png", CompressedImage, lambda frame, n: make_compressed(frame, n, "png")),
+        ):
+            size, latency = measure(node, msg_type, make_msg)
+            print("{0:>10} {1:>12.0f} {2:>12.3f}".format(name, size, latency))
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+if __name__ == "__main__":
+    main()
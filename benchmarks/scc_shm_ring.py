@@ -0,0 +1,138 @@
+#
+# A local stand-in for a screen color coordination node on the same host as the
+# GUI, for comparing the shared memory image ring against sending the raw image
+# inside the color peaks telemetry. By default, synthetic frames go through both
+# paths in-process, each frame's telemetry msg being serialized and deserialized
+# as DDS would, and the serialized size and per-frame cost of getting a
+# display-ready QImage are reported for each. With --serve, frames are instead
+# published at 30 Hz on the GUI's telemetry topic, written to the ring with only
+# a slot reference in the msg, to drive a GUI running with scc_image_transport
+# set to "shm". Add --no-ring to send the raw image instead, as a producer that
+# could not create the ring would, to exercise the GUI's fallback. Run from the
+# package root with the workspace sourced:
+#
+#     QT_QPA_PLATFORM=offscreen python3 -m benchmarks.scc_shm_ring [--serve [--no-ring]]
+#
+
+from sys import argv as sargs
+from time import perf_counter, sleep
+from multiprocessing import resource_tracker
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtWidgets import QApplication
+
+import rclpy
+from rclpy.node import Node
+from rclpy.serialization import deserialize_message, serialize_message
+
+import sh_common_constants
+from sensor_msgs.msg import Image
+from sh_scc_interfaces.msg import ColorPeaksTelem
+
+from scripts import GuiUtils
+from scripts.ShmImageRing import ShmImageRingReader, ShmImageRingWriter
+from benchmarks.scc_image_transport import WIDTH, HEIGHT, make_frame
+
+#
+# Constants
+#
+
+FRAMES = 500
+RING_NAME = "sh_scc_image_ring"
+RING_SLOT_COUNT = 4
+SERVE_PERIOD_S = 1 / 30
+TARGET_SIZE = QSize(GuiUtils.SCC_SCREEN_IMAGE_MAX_WIDTH, GuiUtils.SCC_SCREEN_IMAGE_MAX_HEIGHT)
+
+#
+# Global functions
+#
+
+## Build color peaks telemetry carrying a frame's raw image.
+#  @param frame The BGR frame.
+#  @return The ROS color peaks telemetry msg.
+def make_raw_telem(frame):
+    msg = ColorPeaksTelem()
+    msg.image = Image(encoding="bgr8", width=WIDTH, height=HEIGHT, step=3 * WIDTH)
+    msg.image.data = frame.tobytes()
+    return msg
+
+## Build color peaks telemetry referring to a frame written to the ring.
+#  @param ring The ShmImageRingWriter.
+#  @param frame The BGR frame.
+#  @return The ROS color peaks telemetry msg.
+def make_ring_telem(ring, frame):
+    msg = ColorPeaksTelem()
+    msg.image = ring.write(frame, WIDTH, HEIGHT, 3 * WIDTH, "bgr8")
+    return msg
+
+## Time one path over a number of frames.
+#  @param make_telem A function building the telemetry msg for a frame.
+#  @param convert A function getting a display-ready QImage from a telemetry msg.
+#  @return A tuple of the serialized size, in bytes, and mean time per frame, in milliseconds.
+def time_path(make_telem, convert):
+    frames = [make_frame(n) for n in range(8)]
+    size = 0
+    start = perf_counter()
+    for n in range(FRAMES):
+        data = serialize_message(make_telem(frames[n % len(frames)]))
+        size = len(data)
+        qimg = convert(deserialize_message(data, ColorPeaksTelem))
+        assert not qimg.isNull(), "Frame {0} was not converted".format(n)
+    return size, (1000 * (perf_counter() - start) / FRAMES)
+
+## Compare both paths and print the results.
+def benchmark():
+    app = QApplication(sargs)
+    writer = ShmImageRingWriter(RING_NAME, RING_SLOT_COUNT, 3 * WIDTH * HEIGHT)
+    reader = ShmImageRingReader(RING_NAME)
+    print("{0:>10} {1:>12} {2:>12}".format("transport", "bytes", "frame_ms"))
+    try:
+        size, ms = time_path(
+            make_raw_telem,
+            lambda msg: GuiUtils.get_scaled_qimage_from_rosimg(msg.image, TARGET_SIZE)
+        )
+        print("{0:>10} {1:>12} {2:>12.3f}".format("raw", size, ms))
+        size, ms = time_path(
+            lambda frame: make_ring_telem(writer, frame),
+            lambda msg: reader.get_scaled_qimage(msg.image, TARGET_SIZE)
+        )
+        print("{0:>10} {1:>12} {2:>12.3f}".format("shm", size, ms))
+        print("reader: {0}".format(reader.summary()))
+    finally:
+        reader.close()
+        # The reader stopped this process's resource tracker from tracking the
+        # ring, as if the writer were in another process, so track it again
+        # before the writer removes it
+        resource_tracker.register(writer.shm._name, "shared_memory")
+        writer.close()
+
+## Publish synthetic telemetry on the GUI's topic forever.
+#  @param use_ring Whether to write frames to the ring or send them in the msg.
+def serve(use_ring):
+    rclpy.init()
+    node = Node("scc_shm_ring_producer")
+    telem_pub = node.create_publisher(ColorPeaksTelem, sh_common_constants.topics.COLOR_PEAKS_TELEM, 1)
+    writer = None
+    if use_ring:
+        try:
+            writer = ShmImageRingWriter(RING_NAME, RING_SLOT_COUNT, 3 * WIDTH * HEIGHT)
+        except OSError as e:
+            node.get_logger().warn("Sending raw images, could not create the ring: {0}".format(e))
+    try:
+        n = 0
+        while rclpy.ok():
+            frame = make_frame(n)
+            telem_pub.publish(make_raw_telem(frame) if (writer is None) else make_ring_telem(writer, frame))
+            n += 1
+            sleep(SERVE_PERIOD_S)
+    finally:
+        if writer is not None:
+            writer.close()
+        node.destroy_node()
+        rclpy.shutdown()
+
+if __name__ == "__main__":
+    if "--serve" in sargs:
+        serve("--no-ring" not in sargs)
+    else:
+        benchmark()
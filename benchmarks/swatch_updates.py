@@ -0,0 +1,81 @@
+#
+# Measure how many label swatch updates per second GuiUtils.color_label can do,
+# against the original implementation that built a QColor, round-tripped it
+# through HSV and filled a new QPixmap on every call. The workload mimics the
+# follow hub page: seven labels driven by slowly varying intensities. Run from
+# the package root with the workspace sourced:
+#
+#     QT_QPA_PLATFORM=offscreen python3 -m benchmarks.swatch_updates
+#
+
+from math import sin
+from sys import argv as sargs
+from time import perf_counter
+
+from PyQt5.QtGui import QColor, QPixmap
+from PyQt5.QtWidgets import QApplication, QLabel
+
+from scripts import GuiUtils
+
+#
+# Constants
+#
+
+LABEL_COUNT = 7
+FRAMES = 2000
+
+#
+# Global functions
+#
+
+## The original swatch painting, kept as a baseline.
+#  @param lbl The label widget to paint.
+#  @param r The red channel of the color.
+#  @param g The green channel of the color.
+#  @param b The blue channel of the color.
+#  @param intensity The intensity of the given color.
+def color_label_uncached(lbl, r, g, b, intensity=None):
+    color = QColor(r,g,b)
+    if intensity is not None:
+        if (intensity >= 0) and (intensity <= 1):
+            color.setHsv(
+                color.hue(),
+                color.saturation(),
+                int(color.value() * intensity)
+            )
+    pm = QPixmap(lbl.size())
+    pm.fill(color)
+    lbl.setPixmap(pm)
+
+## Time painting every label for a number of frames.
+#  @param labels The list of labels to paint.
+#  @param paint The swatch painting function.
+#  @return The number of swatch updates per second.
+def time_swatches(labels, paint):
+    app = QApplication.instance()
+    start = perf_counter()
+    for frame in range(FRAMES):
+        for i, lbl in enumerate(labels):
+            paint(lbl, 255, 128, 0, intensity=0.5 + (0.5 * sin((frame * 0.01) + i)))
+        app.processEvents()
+    return (FRAMES * len(labels)) / (perf_counter() - start)
+
+## Run the benchmark and print the results.
+def main():
+    app = QApplication(sargs)
+    labels = [QLabel() for _ in range(LABEL_COUNT)]
+    for lbl in labels:
+        lbl.resize(120, 120)
+        lbl.show()
+    uncached = time_swatches(labels, color_label_uncached)
+    cached = time_swatches(labels, GuiUtils.color_label)
+    print("uncached: {0:.0f} updates/s".format(uncached))
+    print("cached:   {0:.0f} updates/s ({1:.1f}x), {2} hits, {3} misses".format(
+        cached,
+        cached / uncached,
+        GuiUtils.SWATCH_CACHE.hits,
+        GuiUtils.SWATCH_CACHE.misses
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#
+# Measure the time to the first and to all thumbnails of a page of search
+# results, against the original implementation that fetched, decoded and scaled
+# each thumbnail in turn on the main thread. Thumbnails are served by a local
+# HTTP/1.1 server with the given per-request latency, which also counts the
+# connections opened, to show keep-alive reuse. The pooled page is then loaded
+# again from a fresh in-memory cache, as after a restart, so it comes from the
+# on-disk cache, and once more from the warm in-memory cache. Run from the
+# package root with the workspace sourced:
+#
+#     QT_QPA_PLATFORM=offscreen python3 -m benchmarks.thumbnail_fetch [latency_ms]
+#
+
+from sys import argv as sargs
+from time import perf_counter, sleep
+from tempfile import TemporaryDirectory
+from threading import Thread
+from urllib.request import urlopen
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PyQt5.QtGui import QColor, QImage
+from PyQt5.QtWidgets import QApplication
+
+from scripts import GuiUtils
+from scripts.ThumbnailLoader import ThumbnailLoader, THUMBNAIL_MEMORY_CACHE_BYTES, THUMBNAIL_DISK_CACHE_BYTES
+
+#
+# Constants
+#
+
+THUMBNAIL_COUNT = GuiUtils.YOUTUBE_SEARCH_RESULT_COUNT
+
+#
+# Class definitions
+#
+
+## Serves the same JPEG at any path, after a delay, counting connections.
+class ThumbnailHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    body = b""
+    latency_s = 0.0
+    connection_count = 0
+
+    ## Count each new connection.
+    #  @param self The object pointer.
+    def setup(self):
+        super(ThumbnailHandler, self).setup()
+        ThumbnailHandler.connection_count += 1
+
+    ## Serve the thumbnail.
+    #  @param self The object pointer.
+    def do_GET(self):
+        sleep(self.latency_s)
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    ## Keep the output quiet.
+    #  @param self The object pointer.
+    def log_message(self, *args):
+        pass
+
+#
+# Global functions
+#
+
+## Encode a thumbnail-sized JPEG.
+#  @return The JPEG bytes.
+def make_jpeg():
+    qimg = QImage(480, 360, QImage.Format_RGB888)
+    qimg.fill(QColor(200, 40, 40))
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    qimg.save(buf, "JPEG")
+    return bytes(data)
+
+## Fetch every thumbnail in turn on the main thread, as the original did.
+#  @param app The QApplication.
+#  @param urls The thumbnail URLs.
+#  @return A tuple of the time to the first and to all thumbnails, in ms.
+def run_serial(app, urls):
+    start = perf_counter()
+    first = None
+    for url in urls:
+        qimg = QImage.fromData(urlopen(url).read())
+        qimg.scaledToHeight(GuiUtils.YOUTUBE_THUMBNAIL_HEIGHT, Qt.SmoothTransformation)
+        if first is None:
+            first = perf_counter() - start
+        app.processEvents()
+    return 1000 * first, 1000 * (perf_counter() - start)
+
+## Fetch every thumbnail through the ThumbnailLoader.
+#  @param app The QApplication.
+#  @param urls The thumbnail URLs.
+#  @return A tuple of the time to the first and to all thumbnails, in ms.
+def run_pooled(app, urls):
+    loader = ThumbnailLoader.instance()
+    loaded = []
+    record = lambda url, qimg: loaded.append(perf_counter())
+    loader.thumbnail_ready.connect(record)
+    start = perf_counter()
+    for url in urls:
+        loader.load(url)
+    while len(loaded) < len(urls):
+        app.processEvents()
+    loader.thumbnail_ready.disconnect(record)
+    return 1000 * (loaded[0] - start), 1000 * (loaded[-1] - start)
+
+## Load the same thumbnails again with only the on-disk cache warm, as after a restart.
+#  @param app The QApplication.
+#  @param urls The thumbnail URLs.
+#  @return A tuple of the time to the first and to all thumbnails, in ms.
+def run_disk(app, urls):
+    loader = ThumbnailLoader.instance()
+    loader.configure_caches(THUMBNAIL_MEMORY_CACHE_BYTES, THUMBNAIL_DISK_CACHE_BYTES, loader.cache_config[2])
+    return run_pooled(app, urls)
+
+## Run the benchmark and print the results.
+def main():
+    app = QApplication(sargs)
+    ThumbnailHandler.body = make_jpeg()
+    ThumbnailHandler.latency_s = (int(sargs[1]) if (len(sargs) > 1) else 100) / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThumbnailHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    cache_dir = TemporaryDirectory()
+    ThumbnailLoader.instance().configure_caches(THUMBNAIL_MEMORY_CACHE_BYTES, THUMBNAIL_DISK_CACHE_BYTES, cache_dir.name)
+    for name, run, url_set in (
+        ("serial", run_serial, "serial"),
+        ("pooled", run_pooled, "pooled"),
+        ("disk", run_disk, "pooled"),
+        ("memory", run_pooled, "pooled"),
+    ):
+        urls = [
+            "http://127.0.0.1:{0}/{1}/{2}.jpg".format(server.server_port, url_set, n)
+            for n in range(THUMBNAIL_COUNT)
+        ]
+        ThumbnailHandler.connection_count = 0
+        first_ms, all_ms = run(app, urls)
+        print("{0:>6}: first {1:7.1f} ms, all {2:7.1f} ms, {3} connections".format(
+            name,
+            first_ms,
+            all_ms,
+            ThumbnailHandler.connection_count
+        ))
+    print("caches: {0}".format(ThumbnailLoader.instance().summary()))
+    server.shutdown()
+    cache_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
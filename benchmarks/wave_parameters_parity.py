@@ -0,0 +1,121 @@
+#
+# Check that participants synthesizing their own intensities from broadcast wave
+# parameters reproduce the intensities the GUI streams. For each waveform and
+# field, the GUI's wave data is serialized as in parametric wave mode and fed to
+# one LocalWaveParticipant per participant, then both are sampled at the same
+# instants over a few revolutions. Differences of up to one waveform table step
+# are allowed, since each side rounds the wave's location to a table index from
+# its own clock. Exits with a non-zero status if any sample is further off. Run
+# from the package root with the workspace sourced:
+#
+#     python3 -m benchmarks.wave_parameters_parity
+#
+
+from sys import exit as sexit
+from math import pi
+from time import perf_counter
+
+import numpy as np
+
+from sh_common_interfaces.msg import WaveParticipantLocation
+
+from scripts import Waveforms, WaveFields
+from scripts.GuiController import WaveUpdateData
+from scripts.WaveParameters import LocalWaveParticipant
+
+#
+# Constants
+#
+
+PARTICIPANT_COUNT = 64
+GRID_WIDTH = 8
+PERIOD_MS = 2000
+SAMPLE_COUNT = 500
+SAMPLE_SPAN_S = 3 * PERIOD_MS / 1000
+WAVEFORMS = (Waveforms.SINE, Waveforms.TRIANGLE, Waveforms.GAUSSIAN_PULSE, Waveforms.CHASE)
+FIELDS = (
+    ("angular", WaveFields.AngularField()),
+    ("radial", WaveFields.RadialField([(0.0, 0.0), (7.0, 7.0)], 4.0)),
+    ("planar", WaveFields.PlanarField([(1.0, 1.0)], 5.0)),
+    ("superposed", WaveFields.SuperposedField([
+        WaveFields.RadialField([(3.5, 3.5)], 3.0),
+        WaveFields.PlanarField([(0.0, 1.0)], 6.0),
+    ])),
+)
+
+#
+# Global functions
+#
+
+## Build the GUI's wave data for a grid of participants.
+#  @param waveform The WaveformTable of the wave's shape.
+#  @param field The field describing how the wave propagates through space.
+#  @param now The monotonic timestamp, in seconds, to start the wave at.
+#  @return The WaveUpdateData.
+def make_wave_update_data(waveform, field, now):
+    data = WaveUpdateData(0)
+    for i in range(PARTICIPANT_COUNT):
+        position = 2 * pi * i / PARTICIPANT_COUNT
+        data.add_participant(WaveParticipantLocation(participant_id=i, position=position), now)
+    data.flush_participants(now)
+    for i in range(PARTICIPANT_COUNT):
+        data.set_participant_coordinates(i, (float(i % GRID_WIDTH), float(i // GRID_WIDTH)))
+    data.set_field(field)
+    data.set_period(PERIOD_MS, now, waveform)
+    return data
+
+## Sample both implementations and compare them.
+#  @param waveform The WaveformTable of the wave's shape.
+#  @param field The field describing how the wave propagates through space.
+#  @return A tuple of the max absolute difference, the allowed difference, the
+#  number of samples further off than allowed, and the mean time per
+#  participant-side intensity, in microseconds.
+def compare(waveform, field):
+    now = 1000.0
+    wall_now = 1700000000.0
+    data = make_wave_update_data(waveform, field, now)
+    params = data.get_parameters(wall_now, now)
+    participants = [LocalWaveParticipant(i) for i in range(PARTICIPANT_COUNT)]
+    for participant in participants:
+        participant.update_parameters(params)
+    table = waveform.table
+    tolerance = float(np.max(np.abs(table - np.roll(table, 1)))) + 1e-9
+    max_error = 0.0
+    mismatches = 0
+    local_time = 0.0
+    for dt in np.linspace(0.0, SAMPLE_SPAN_S, SAMPLE_COUNT):
+        data.advance_to(now + dt)
+        streamed = data.calc_intensities()
+        start = perf_counter()
+        local = np.array([p.intensity_at(wall_now + dt) for p in participants])
+        local_time += perf_counter() - start
+        errors = np.abs(local - streamed)
+        max_error = max(max_error, float(np.max(errors)))
+        mismatches += int(np.count_nonzero(errors > tolerance))
+    return max_error, tolerance, mismatches, 1e6 * local_time / (SAMPLE_COUNT * PARTICIPANT_COUNT)
+
+## Run the check and print a table of the results.
+def main():
+    print("{0:>16} {1:>12} {2:>12} {3:>12} {4:>12} {5:>10}".format(
+        "waveform", "field", "max_error", "tolerance", "mismatches", "local_us"
+    ))
+    failed = False
+    for waveform_name in WAVEFORMS:
+        waveform = Waveforms.build_waveform_table(waveform_name)
+        for field_name, field in FIELDS:
+            max_error, tolerance, mismatches, local_us = compare(waveform, field)
+            failed = failed or (mismatches > 0)
+            print("{0:>16} {1:>12} {2:>12.6f} {3:>12.6f} {4:>12} {5:>10.2f}".format(
+                waveform_name,
+                field_name,
+                max_error,
+                tolerance,
+                mismatches,
+                local_us
+            ))
+    if failed:
+        print("Participant-side intensities drifted from the streamed ones.")
+        sexit(1)
+
+if __name__ == "__main__":
+    main()
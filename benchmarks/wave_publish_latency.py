@@ -0,0 +1,98 @@
+#
+# Measure end-to-end WaveUpdate publish latency against the number of wave
+# participants. Each tick samples every participant's intensity, encodes the
+# WaveUpdate msg(s), publishes them and spins a local subscriber until all of
+# them are received. Run from the package root with the workspace sourced:
+#
+#     python3 -m benchmarks.wave_publish_latency
+#
+
+from time import monotonic, perf_counter
+from statistics import median, quantiles
+
+import rclpy
+from rclpy.node import Node
+from rclpy.executors import SingleThreadedExecutor
+
+import sh_common_constants
+from sh_common_interfaces.msg import WaveUpdate, WaveParticipantLocation
+
+from scripts.GuiController import WaveUpdateData
+from scripts.GuiNode import MAX_AUX_DEVICE_COUNT, wave_queue_depth
+from scripts.WaveUpdateEncoder import WaveUpdateEncoder
+
+#
+# Constants
+#
+
+PARTICIPANT_COUNTS = (32, 100, 250, 500, 1000)
+TICKS = 500
+
+#
+# Global functions
+#
+
+## Measure the publish latency for some number of participants.
+#  @param node The ROS node to create the publisher and subscriber on.
+#  @param executor The executor spinning the node.
+#  @param participant_count The number of wave participants.
+#  @param shard_size The max number of participants per msg, or zero for no limit.
+#  @return The list of per-tick latencies, in seconds.
+def measure(node, executor, participant_count, shard_size):
+    depth = wave_queue_depth(participant_count)
+    received = [0]
+    def callback(msg):
+        received[0] += 1
+    pub = node.create_publisher(WaveUpdate, sh_common_constants.topics.WAVE_UPDATES, depth)
+    sub = node.create_subscription(WaveUpdate, sh_common_constants.topics.WAVE_UPDATES, callback, depth)
+
+    now = monotonic()
+    data = WaveUpdateData(0)
+    data.set_period(2000, now)
+    for i in range(participant_count):
+        data.add_participant(WaveParticipantLocation(participant_id=i, position=float(i)), now)
+    data.flush_participants(now)
+    encoder = WaveUpdateEncoder(shard_size=shard_size)
+
+    # Let discovery settle before timing anything
+    for _ in range(20):
+        executor.spin_once(timeout_sec=0.01)
+
+    latencies = []
+    for _ in range(TICKS):
+        start = perf_counter()
+        msgs = data.consume_intensities(monotonic(), encoder)
+        expected = received[0] + len(msgs)
+        for msg in msgs:
+            pub.publish(msg)
+        while (received[0] < expected) and (perf_counter() - start < 1.0):
+            executor.spin_once(timeout_sec=0.001)
+        latencies.append(perf_counter() - start)
+
+    node.destroy_subscription(sub)
+    node.destroy_publisher(pub)
+    return latencies
+
+## Run the benchmark and print a table of the results.
+def main():
+    rclpy.init()
+    node = Node("wave_publish_latency_benchmark")
+    executor = SingleThreadedExecutor()
+    executor.add_node(node)
+    print("{0:>12} {1:>12} {2:>12} {3:>12}".format("participants", "shard_size", "median_ms", "p99_ms"))
+    try:
+        for shard_size in (0, MAX_AUX_DEVICE_COUNT):
+            for participant_count in PARTICIPANT_COUNTS:
+                latencies = measure(node, executor, participant_count, shard_size)
+                print("{0:>12} {1:>12} {2:>12.3f} {3:>12.3f}".format(
+                    participant_count,
+                    shard_size,
+                    1000 * median(latencies),
+                    1000 * quantiles(latencies, n=100)[98]
+                ))
+    finally:
+        node.destroy_node()
+        rclpy.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#
+# Measure how long the Qt main thread stalls while YouTube searches run, against
+# the original implementation that searched synchronously on the main thread.
+# A 10 ms timer stands in for the wave ticks and clock updates, and the longest
+# gap between its ticks is reported. Searches go to the local stand-in backend
+# with the given latency, so no network is needed. The asynchronous run also
+# types a burst of queries to show that superseded searches are dropped, and is
+# repeated through the query result cache once it is warm. The paged run then
+# scrolls through the first few pages of one query, a page at a time. Run from
+# the package root with the workspace sourced:
+#
+#     QT_QPA_PLATFORM=offscreen python3 -m benchmarks.youtube_search [latency_ms]
+#
+
+from sys import argv as sargs
+from time import perf_counter
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+
+from scripts import GuiUtils
+from scripts.YouTubeSearch import CachingSearchBackend, LocalSearchBackend, YouTubeSearcher
+
+#
+# Constants
+#
+
+TICK_PERIOD_MS = 10
+QUERIES = ("l", "lo", "lof", "lofi", "lofi beats")
+PAGE_COUNT = 3
+
+#
+# Class definitions
+#
+
+## Records the longest gap between timer ticks on the main thread.
+class TickMonitor(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    def __init__(self):
+        self.last = perf_counter()
+        self.max_gap = 0.0
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.tick)
+        self.timer.start(TICK_PERIOD_MS)
+
+    ## Record the gap since the last tick.
+    #  @param self The object pointer.
+    def tick(self):
+        now = perf_counter()
+        self.max_gap = max(self.max_gap, now - self.last)
+        self.last = now
+
+#
+# Global functions
+#
+
+## Run every query synchronously on the main thread, as the original did.
+#  @param app The QApplication.
+#  @param backend The search backend.
+#  @return A tuple of the number of results shown and the time taken, in seconds.
+def run_sync(app, backend):
+    start = perf_counter()
+    shown = 0
+    for query in QUERIES:
+        app.processEvents()
+        shown = len(list(next(backend.pages(query, GuiUtils.YOUTUBE_SEARCH_RESULT_COUNT))))
+    return shown, perf_counter() - start
+
+## Start every query in a burst through a YouTubeSearcher and wait for the last.
+#  @param app The QApplication.
+#  @param backend The search backend.
+#  @return A tuple of the number of results shown and the time taken, in seconds.
+def run_async(app, backend):
+    searcher = YouTubeSearcher(backend)
+    shown = []
+    done = []
+    searcher.result_found.connect(lambda search_id, result: searcher.is_current(search_id) and shown.append(result))
+    searcher.page_finished.connect(lambda search_id, error, has_more: searcher.is_current(search_id) and done.append(error))
+    start = perf_counter()
+    for query in QUERIES:
+        searcher.search(query)
+    while not done:
+        app.processEvents()
+    return len(shown), perf_counter() - start
+
+## Search for the last query through a YouTubeSearcher and fetch each further
+#  page once the one before it is done, as scrolling to the bottom would.
+#  @param app The QApplication.
+#  @param backend The search backend.
+#  @return A tuple of the number of results shown and the time taken, in seconds.
+def run_paged(app, backend):
+    searcher = YouTubeSearcher(backend)
+    shown = []
+    done = []
+    searcher.result_found.connect(lambda search_id, result: shown.append(result))
+    searcher.page_finished.connect(lambda search_id, error, has_more: done.append(has_more))
+    start = perf_counter()
+    searcher.search(QUERIES[-1])
+    while (len(done) < PAGE_COUNT) and ((not done) or done[-1]):
+        app.processEvents()
+        if done:
+            searcher.fetch_next_page()
+    return len(shown), perf_counter() - start
+
+## Run the benchmark and print the results.
+def main():
+    app = QApplication(sargs)
+    latency_ms = int(sargs[1]) if (len(sargs) > 1) else 500
+    backend = LocalSearchBackend(latency_ms)
+    # Warm the query result cache up front, so only replaying from it is timed
+    caching_backend = CachingSearchBackend(backend, ttl_s=60)
+    for query in QUERIES:
+        next(caching_backend.pages(query, GuiUtils.YOUTUBE_SEARCH_RESULT_COUNT))
+    for name, run, run_backend in (
+        ("sync", run_sync, backend),
+        ("async", run_async, backend),
+        ("cached", run_async, caching_backend),
+        ("paged", run_paged, backend),
+    ):
+        monitor = TickMonitor()
+        shown, elapsed = run(app, run_backend)
+        monitor.timer.stop()
+        print("{0:>6}: {1} results shown in {2:.3f} s, longest main thread stall {3:.1f} ms".format(
+            name,
+            shown,
+            elapsed,
+            1000 * monitor.max_gap
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from threading import Lock
+
+## A thread-safe, single-slot mailbox where the newest value always wins. A
+#  producer thread puts values in, overwriting (and counting as dropped) any value
+#  not yet taken, and a consumer takes the latest value when it is ready for it.
+class ConflatingMailbox(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    def __init__(self):
+        self.lock = Lock()
+        self.value = None
+        self.received_count = 0
+        self.taken_count = 0
+        self.dropped_count = 0
+
+    ## Put a value in the mailbox, replacing any value not yet taken.
+    #  @param self The object pointer.
+    #  @param value The value, which must not be null.
+    #  @return Whether or not the mailbox was empty, in which case the consumer
+    #  should be notified; otherwise, a notification is already pending.
+    def put(self, value):
+        with self.lock:
+            self.received_count += 1
+            was_empty = self.value is None
+            if not was_empty:
+                self.dropped_count += 1
+            self.value = value
+            return was_empty
+
+    ## Take the latest value out of the mailbox.
+    #  @param self The object pointer.
+    #  @return The latest value, or null if the mailbox is empty.
+    def take(self):
+        with self.lock:
+            value = self.value
+            self.value = None
+            if value is not None:
+                self.taken_count += 1
+            return value
+
+    ## Empty the mailbox, counting any value not yet taken as dropped.
+    #  @param self The object pointer.
+    def clear(self):
+        with self.lock:
+            if self.value is not None:
+                self.dropped_count += 1
+            self.value = None
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        with self.lock:
+            return "received={0}, taken={1}, dropped={2}".format(
+                self.received_count,
+                self.taken_count,
+                self.dropped_count
+            )
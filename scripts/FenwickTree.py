@@ -0,0 +1,56 @@
+from array import array
+
+## A binary indexed tree of counts over a fixed number of bins, supporting
+#  point updates, prefix sums, and finding the bin holding the k-th smallest
+#  item, each in O(log n).
+class FenwickTree(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param size The number of bins.
+    def __init__(self, size):
+        self.size = size
+        self.tree = array("q", bytes(8 * (size + 1)))
+        # The largest power of two not greater than the size, for binary lifting
+        self.top_bit = 1 << (size.bit_length() - 1) if size else 0
+
+    ## Add to the count of a bin.
+    #  @param self The object pointer.
+    #  @param index The zero-based index of the bin.
+    #  @param delta The amount to add to the bin's count.
+    def add(self, index, delta):
+        tree = self.tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & (-i)
+
+    ## Get the total count of all bins up to and including the given bin.
+    #  @param self The object pointer.
+    #  @param index The zero-based index of the bin.
+    #  @return The prefix sum.
+    def prefix_sum(self, index):
+        tree = self.tree
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += tree[i]
+            i -= i & (-i)
+        return total
+
+    ## Find the bin holding the k-th smallest item, counting from zero.
+    #  @param self The object pointer.
+    #  @param k The zero-based rank of the item.
+    #  @return The zero-based index of the bin.
+    def find_kth(self, k):
+        tree = self.tree
+        pos = 0
+        remaining = k
+        step = self.top_bit
+        while step:
+            nxt = pos + step
+            if (nxt <= self.size) and (tree[nxt] <= remaining):
+                pos = nxt
+                remaining -= tree[nxt]
+            step >>= 1
+        return pos
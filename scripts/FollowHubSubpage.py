@@ -1,11 +1,13 @@
-from queue import Queue
-from math import e
+from array import array
+from math import isnan
+
+import numpy as np
 
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QColor, QColorConstants
 
 from scripts import GuiUtils
-from scripts.DoublyLinkedList import DoublyLinkedList
+from scripts.FenwickTree import FenwickTree
 from scripts.Ui_FollowHubSubpage import Ui_FollowHubSubpage
 
 #
@@ -16,38 +18,199 @@ from scripts.Ui_FollowHubSubpage import Ui_FollowHubSubpage
 NUM_ELEMS = 7
 # The max number of samples in the FFT window to monitor
 WINDOW_LENGTH = 450
+# Normalize intensities against the window's absolute min and max frequencies
+NORMALIZATION_MINMAX = "minmax"
+# Normalize intensities against low and high percentiles of the window's frequencies
+NORMALIZATION_PERCENTILE = "percentile"
+# The default low and high percentiles to normalize against
+DEFAULT_PERCENTILES = (5, 95)
+# The range of frequencies, and number of bins to quantize it into, for percentile queries
+PERCENTILE_FREQUENCY_RANGE = (0.0, 20000.0)
+PERCENTILE_BIN_COUNT = 4096
 
 #
 # Class definitions
 #
 
-## A container that keeps a linked-list of frequencies that are also pushed/popped in/out
-#  of a queue to maintain a sliding window of frequencies.
+## A container that maintains statistics over a sliding window of frequencies.
+#  Samples live in a preallocated ring buffer, and the window's min/max are tracked
+#  by two monotonic deques of sample indices, themselves preallocated ring buffers.
+#  The front of each deque is always the window's min/max, and each sample is
+#  pushed and popped at most once, so inserts are amortized O(1) and queries are
+#  O(1). The mean and variance are updated incrementally as samples enter and
+#  leave the window. Nothing is allocated per sample. Optionally, samples are also
+#  counted in a Fenwick tree over quantized frequency bins so that arbitrary
+#  percentiles can be queried in O(log n).
 class FrequencyWindowManager(object):
 
     ## The constructor.
     #  @param self The object pointer.
-    def __init__(self):
-        self.ll = DoublyLinkedList()
-        self.queue = Queue()
-        self.queue_size = 0
+    #  @param window_length The max number of samples in the window.
+    #  @param percentile_bins Either null to disable percentile queries, or a
+    #  tuple of the (low frequency, high frequency, bin count) to quantize into.
+    def __init__(self, window_length=WINDOW_LENGTH, percentile_bins=None):
+        self.window_length = window_length
+        if percentile_bins is None:
+            self.percentile_index = None
+        else:
+            self.bin_low, bin_high, bin_count = percentile_bins
+            self.bin_width = (bin_high - self.bin_low) / bin_count
+            self.percentile_index = FenwickTree(bin_count)
+        self.values = array("d", bytes(8 * window_length))
+        self.min_indices = array("q", bytes(8 * window_length))
+        self.max_indices = array("q", bytes(8 * window_length))
+        self.min_head = 0
+        self.min_tail = 0
+        self.max_head = 0
+        self.max_tail = 0
+        self.sample_count = 0
+        self.size = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    ## Get the percentile bin a frequency falls into, clamping to the end bins.
+    #  @param self The object pointer.
+    #  @param value The frequency.
+    #  @return The zero-based index of the bin.
+    def bin_of(self, value):
+        index = int((value - self.bin_low) / self.bin_width)
+        return min(max(index, 0), self.percentile_index.size - 1)
 
     ## Insert a value into the frequency window.
     #  @param self The object pointer.
     #  @param value The frequency to insert into the sliding window.
     def insert(self, value):
-        while self.queue_size >= WINDOW_LENGTH:
-            self.ll.remove(self.queue.get())
-            self.queue.task_done()
-            self.queue_size -= 1
-        self.queue.put(self.ll.insert(value))
-        self.queue_size += 1
+        n = self.window_length
+        values = self.values
+        index = self.sample_count
+        slot = index % n
+        self.sample_count += 1
+
+        # Drop the sample about to slide out of the window from the deques' fronts
+        oldest = index - n
+        if (self.min_tail > self.min_head) and (self.min_indices[self.min_head % n] <= oldest):
+            self.min_head += 1
+        if (self.max_tail > self.max_head) and (self.max_indices[self.max_head % n] <= oldest):
+            self.max_head += 1
+
+        # Update the mean and sum of squared differences (Welford's method,
+        # replacing the evicted sample once the window is full)
+        if self.size == n:
+            evicted = values[slot]
+            delta = value - evicted
+            new_mean = self.mean + (delta / n)
+            self.m2 += delta * ((value - new_mean) + (evicted - self.mean))
+            self.mean = new_mean
+            if self.percentile_index is not None:
+                self.percentile_index.add(self.bin_of(evicted), -1)
+        else:
+            self.size += 1
+            delta = value - self.mean
+            self.mean += delta / self.size
+            self.m2 += delta * (value - self.mean)
+        values[slot] = value
+        if self.percentile_index is not None:
+            self.percentile_index.add(self.bin_of(value), 1)
+
+        # Drop samples that can never be the min/max again now that this one is newer
+        min_indices = self.min_indices
+        while (self.min_tail > self.min_head) and (values[min_indices[(self.min_tail - 1) % n] % n] >= value):
+            self.min_tail -= 1
+        min_indices[self.min_tail % n] = index
+        self.min_tail += 1
+        max_indices = self.max_indices
+        while (self.max_tail > self.max_head) and (values[max_indices[(self.max_tail - 1) % n] % n] <= value):
+            self.max_tail -= 1
+        max_indices[self.max_tail % n] = index
+        self.max_tail += 1
 
     ## Helper function to get the current min and max frequencies of the window.
     #  @param self The object pointer.
-    #  @return A tuple of the (min,max) frequency.
+    #  @return A tuple of the (min,max) frequency, each null if the window is empty.
+    def get_mm(self):
+        if 0 == self.size:
+            return None, None
+        n = self.window_length
+        return (
+            self.values[self.min_indices[self.min_head % n] % n],
+            self.values[self.max_indices[self.max_head % n] % n]
+        )
+
+    ## Helper function to get a percentile of the window's frequencies, using the
+    #  nearest-rank method, accurate to the width of a percentile bin.
+    #  @warning Requires percentile bins to have been given to the constructor.
+    #  @param self The object pointer.
+    #  @param percentile The percentile, in the range [0,100].
+    #  @return The center frequency of the bin holding the percentile, null if the
+    #  window is empty.
+    def get_percentile(self, percentile):
+        if 0 == self.size:
+            return None
+        rank = min(max(int(-(-percentile * self.size // 100)) - 1, 0), self.size - 1)
+        return self.bin_low + ((self.percentile_index.find_kth(rank) + 0.5) * self.bin_width)
+
+    ## Helper function to get the current mean frequency of the window.
+    #  @param self The object pointer.
+    #  @return The mean frequency, null if the window is empty.
+    def get_mean(self):
+        return self.mean if self.size else None
+
+    ## Helper function to get the current (population) variance of the window.
+    #  @param self The object pointer.
+    #  @return The variance, null if the window is empty.
+    def get_variance(self):
+        return (max(self.m2, 0.0) / self.size) if self.size else None
+
+    ## Helper function to get all statistics of the window at once.
+    #  @param self The object pointer.
+    #  @return A tuple of the (min,max,mean,variance) frequency.
+    def get_stats(self):
+        wmin, wmax = self.get_mm()
+        return wmin, wmax, self.get_mean(), self.get_variance()
+
+## A set of frequency windows, one per frequency band, updated together from a
+#  full spectrum per sample.
+class MultiBandFrequencyWindow(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param band_count The number of frequency bands.
+    #  @param window_length The max number of samples in each band's window.
+    #  @param percentile_bins Either null to disable percentile queries, or a
+    #  tuple of the (low frequency, high frequency, bin count) to quantize into.
+    def __init__(self, band_count, window_length=WINDOW_LENGTH, percentile_bins=None):
+        self.band_count = band_count
+        self.windows = [FrequencyWindowManager(window_length, percentile_bins) for _ in range(band_count)]
+        self.wmin = np.empty(band_count, dtype=np.float64)
+        self.wmax = np.empty(band_count, dtype=np.float64)
+
+    ## Insert one sample of every band into their windows.
+    #  @param self The object pointer.
+    #  @param freqs The sequence of frequencies, one per band.
+    def insert(self, freqs):
+        wmin = self.wmin
+        wmax = self.wmax
+        for i, window in enumerate(self.windows):
+            window.insert(freqs[i])
+            wmin[i], wmax[i] = window.get_mm()
+
+    ## Helper function to get the current min and max frequencies of every band.
+    #  @param self The object pointer.
+    #  @return A tuple of the (min,max) arrays of frequencies.
     def get_mm(self):
-        return self.ll.lmin.parent.value, self.ll.lmax.child.value
+        return self.wmin, self.wmax
+
+    ## Helper function to get low and high percentiles of every band.
+    #  @warning Requires percentile bins to have been given to the constructor.
+    #  @param self The object pointer.
+    #  @param percentiles The tuple of the (low,high) percentiles, each in [0,100].
+    #  @return A tuple of the (low,high) arrays of frequencies.
+    def get_percentiles(self, percentiles):
+        low, high = percentiles
+        return (
+            np.fromiter((w.get_percentile(low) for w in self.windows), dtype=np.float64, count=self.band_count),
+            np.fromiter((w.get_percentile(high) for w in self.windows), dtype=np.float64, count=self.band_count)
+        )
 
 ## A simple demo for how playback frequencies change light intensity.
 class FollowHubSubpage(QWidget):
@@ -62,10 +225,7 @@ class FollowHubSubpage(QWidget):
         self.ui = Ui_FollowHubSubpage()
         self.ui.setupUi(self)
 
-        # Local variables
-        self.freq_manager = FrequencyWindowManager()
-
-        # Set initial label colors
+        # The labels displaying the first elements, and their colors at full intensity
         self.lbl_color_pairs = (
             (self.ui.red_lbl, QColorConstants.Red),
             (self.ui.org_lbl, QColor(255, 128, 0)),
@@ -75,39 +235,116 @@ class FollowHubSubpage(QWidget):
             (self.ui.ind_lbl, QColor(75, 0, 130)),
             (self.ui.vlt_lbl, QColorConstants.Magenta)
         )
-        self.set_lbl_intensities([1]*NUM_ELEMS)
+
+        # Local variables
+        self.configure()
+
+        # Set initial label colors
+        self.set_lbl_intensities([1]*len(self.lbl_color_pairs))
 
         # Done
         self.show()
 
-    ## Given the calculated frequencies, calculate the intensities of all visual elements.
+    ## Set the number of visual elements, the frequency window length, and how
+    #  intensities are normalized, which resets all frequency windows.
+    #  @param self The object pointer.
+    #  @param num_elems The number of elements to manipulate given the playback
+    #  intensities, of which only as many as there are labels are displayed.
+    #  @param window_length The max number of samples in each frequency window.
+    #  @param normalization Either NORMALIZATION_MINMAX or NORMALIZATION_PERCENTILE.
+    #  @param percentiles The tuple of the (low,high) percentiles to normalize
+    #  against, each in [0,100], if normalizing by percentile.
+    def configure(
+            self,
+            num_elems=NUM_ELEMS,
+            window_length=WINDOW_LENGTH,
+            normalization=NORMALIZATION_MINMAX,
+            percentiles=DEFAULT_PERCENTILES
+    ):
+        if num_elems <= 0:
+            raise ValueError("The number of elements must be positive, not {0}".format(num_elems))
+        if window_length <= 0:
+            raise ValueError("The frequency window length must be positive, not {0}".format(window_length))
+        self.num_elems = num_elems
+        self.window_length = window_length
+        self.normalization = normalization
+        self.percentiles = percentiles
+        self.percentile_bins = (PERCENTILE_FREQUENCY_RANGE + (PERCENTILE_BIN_COUNT,)) \
+            if (NORMALIZATION_PERCENTILE == normalization) else None
+        self.freq_manager = FrequencyWindowManager(window_length, self.percentile_bins)
+        self.band_manager = None
+        # The fraction of the window's range that each element is centered at
+        self.elem_fractions = np.arange(num_elems, dtype=np.float64) / max(num_elems - 1, 1)
+
+    ## Given the calculated frequencies, calculate the intensities of all visual
+    #  elements. When normalizing by percentile, frequencies outside the percentile
+    #  range are clamped to it, so outliers saturate rather than squash the rest.
     #  @param self The object pointer.
     #  @param freqs The list of calculated frequencies.
     def calc_intensities(self, freqs):
         freq = freqs[0]
         self.freq_manager.insert(freq)
-        wmin, wmax = self.freq_manager.get_mm()
+        if NORMALIZATION_PERCENTILE == self.normalization:
+            wmin = self.freq_manager.get_percentile(self.percentiles[0])
+            wmax = self.freq_manager.get_percentile(self.percentiles[1])
+            freq = min(max(freq, wmin), wmax)
+        else:
+            wmin, wmax = self.freq_manager.get_mm()
         wsize = wmax - wmin
         if abs(wsize) < 0.000001:
             return None
         else:
-            step = wsize / (NUM_ELEMS-1)
-            return tuple(
-                1-pow(e, -3*abs((freq-(step*i)-wmin) / wsize)) for i in range(NUM_ELEMS)
-            )
+            return 1 - np.exp(-3 * np.abs(((freq - wmin) / wsize) - self.elem_fractions))
 
-    ## Set the NUM_ELEMS labels to the given intensities (HSV values).
-    #  @warning Assumes exactly NUM_ELEMS intensities are given.
+    ## Given the full spectrum of calculated frequencies, calculate the intensities
+    #  of all visual elements for every frequency band at once. Each band keeps its
+    #  own sliding window, and the windows are rebuilt if the number of bands changes.
     #  @param self The object pointer.
-    #  @param intensities The list of intensities to set the color for each respective label.
+    #  @param freqs The sequence of calculated frequencies, one per band.
+    #  @return The (bands,elements) array of intensities, where the rows of bands
+    #  whose window has no range yet are NaN.
+    def calc_band_intensities(self, freqs):
+        freqs = np.asarray(freqs, dtype=np.float64)
+        if (self.band_manager is None) or (self.band_manager.band_count != len(freqs)):
+            self.band_manager = MultiBandFrequencyWindow(len(freqs), self.window_length, self.percentile_bins)
+        self.band_manager.insert(freqs.tolist())
+        if NORMALIZATION_PERCENTILE == self.normalization:
+            wmin, wmax = self.band_manager.get_percentiles(self.percentiles)
+            freqs = np.clip(freqs, wmin, wmax)
+        else:
+            wmin, wmax = self.band_manager.get_mm()
+        wsize = wmax - wmin
+        degenerate = np.abs(wsize) < 0.000001
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intensities = 1 - np.exp(-3 * np.abs(((freqs - wmin) / wsize)[:, np.newaxis] - self.elem_fractions))
+        intensities[degenerate] = np.nan
+        return intensities
+
+    ## Set the labels to the given intensities (HSV values). Labels beyond the
+    #  number of intensities given, and NaN intensities, are left unchanged, and
+    #  intensities beyond the number of labels are not displayed. Given
+    #  the intensities of every frequency band, as from calc_band_intensities, each
+    #  label shows the brightest of its element's intensities across the bands.
+    #  @param self The object pointer.
+    #  @param intensities The list of intensities to set the color for each
+    #  respective label, or the (bands,elements) array of them.
     def set_lbl_intensities(self, intensities):
+        if (intensities is not None) and (2 == np.ndim(intensities)):
+            intensities = np.asarray(intensities)
+            ranged = ~np.isnan(intensities)
+            intensities = np.where(
+                ranged.any(axis=0),
+                np.max(np.where(ranged, intensities, -np.inf), axis=0),
+                np.nan
+            )
         if intensities is not None:
-            for i in range(NUM_ELEMS):
-                lbl, color = self.lbl_color_pairs[i]
+            for (lbl, color), intensity in zip(self.lbl_color_pairs, intensities):
+                if isnan(intensity):
+                    continue
                 GuiUtils.color_label(
                     lbl,
                     color.red(),
                     color.green(),
                     color.blue(),
-                    intensity=intensities[i]
+                    intensity=intensity
                 )
@@ -0,0 +1,65 @@
+from time import perf_counter
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+
+## A widget that paints the current frame of a live image stream directly from a
+#  QImage. Its geometry only changes when the frame dimensions change, so new
+#  frames never trigger a relayout, and only the region Qt asks for is repainted.
+class FrameView(QWidget):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param parent This object's optional Qt parent.
+    def __init__(self, parent=None):
+        super(FrameView, self).__init__(parent)
+        # Local variable(s)
+        self.image = None
+        self.paint_count = 0
+        self.last_paint_ms = 0.0
+        self.total_paint_ms = 0.0
+        # Every pixel is painted by the frame, so skip erasing the background
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        # Done
+        self.show()
+
+    ## Set the frame to display.
+    #  @param self The object pointer.
+    #  @param qimg The QImage of the frame.
+    def set_image(self, qimg):
+        self.image = qimg
+        if (qimg.width() != self.width()) or (qimg.height() != self.height()):
+            self.setFixedSize(qimg.width(), qimg.height())
+        self.update()
+
+    ## Get the mean time spent painting each frame.
+    #  @param self The object pointer.
+    #  @return The mean paint time, in milliseconds.
+    def mean_paint_ms(self):
+        return (self.total_paint_ms / self.paint_count) if self.paint_count else 0.0
+
+    ## Get a human-readable summary of the paint counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        return "paints={0}, mean={1:.2f} ms, last={2:.2f} ms".format(
+            self.paint_count,
+            self.mean_paint_ms(),
+            self.last_paint_ms
+        )
+
+    ## Override paintEvent to draw the dirty region of the current frame.
+    #  @param self The object pointer.
+    #  @param evt The paint event.
+    def paintEvent(self, evt):
+        if self.image is None: return
+        start = perf_counter()
+        rect = evt.rect()
+        painter = QPainter(self)
+        painter.drawImage(rect, self.image, rect)
+        painter.end()
+        self.last_paint_ms = 1000 * (perf_counter() - start)
+        self.total_paint_ms += self.last_paint_ms
+        self.paint_count += 1
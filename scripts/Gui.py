@@ -76,6 +76,16 @@ class Gui(QMainWindow):
         )
         self.change_stacked_group(self.ui.curr_stacked_group_dropdown.currentIndex())
 
+        # Read SCC screen images from the shared memory ring, if it is in use
+        self.ui.screen_color_coordination_page.set_image_ring(self.gui_controller.scc_image_ring)
+        self.gui_controller.set_scc_page(self.ui.screen_color_coordination_page)
+        # Send YouTube searches to the configured backend
+        self.ui.sound_file_playback_page.set_search_backend(self.gui_controller.youtube_search_backend)
+        self.ui.sound_file_playback_page.set_search_as_you_type(
+            self.gui_controller.gui_node.youtube_search_as_you_type,
+            self.gui_controller.gui_node.youtube_search_debounce_ms
+        )
+
         # Set this text here because it's easier to do so than in the .ui file
         self.ui.prev_page_btn.setText("<<")
         self.ui.next_page_btn.setText(">>")
@@ -85,19 +95,24 @@ class Gui(QMainWindow):
         #
 
         self.ui.curr_stacked_group_dropdown.currentIndexChanged.connect(self.change_stacked_group)
+        self.ui.stacked_page_groups.currentChanged.connect(self.update_data_feeds)
+        for i in range(self.ui.stacked_page_groups.count()):
+            self.ui.stacked_page_groups.widget(i).currentChanged.connect(self.update_data_feeds)
         self.ui.prev_page_btn.pressed.connect(self.go_to_prev_page)
         self.ui.next_page_btn.pressed.connect(self.go_to_next_page)
         self.gui_controller.one_hertz_timer.timeout.connect(self.handle_date_time_update)
         self.ui.morning_countdown_subpage.countdown_goal_updated.connect(self.gui_controller.set_countdown_goals)
         self.gui_controller.countdown_state_updated.connect(self.ui.morning_countdown_subpage.update_countdown_state)
-        self.gui_controller.wave_participant_responded.connect(self.gui_controller.add_wave_update_participant)
-        self.gui_controller.scc_telemetry_updated.connect(self.ui.screen_color_coordination_page.update_scc_telemetry)
+        self.gui_controller.scc_telemetry_available.connect(self.handle_scc_telemetry_available)
+        self.gui_controller.scc_compressed_image_available.connect(self.handle_scc_compressed_image_available)
         self.ui.sound_file_playback_page.audio_download_queue_requested.connect(self.gui_controller.queue_youtube_video_for_download)
         self.gui_controller.audio_download_queue_confirmed.connect(self.ui.sound_file_playback_page.queue_video)
         self.gui_controller.audio_download_completion_updated.connect(self.ui.sound_file_playback_page.update_download_percent_complete)
         self.gui_controller.audio_analysis_status_updated.connect(self.ui.sound_file_playback_page.update_analysis_status)
         self.gui_controller.starting_sound_file_playback.connect(self.ui.sound_file_playback_page.deque_audio_download)
         self.ui.sound_file_playback_page.sf_playback_command_requested.connect(self.gui_controller.send_playback_command)
+        self.ui.sound_file_playback_page.youtube_search_failed.connect(self.gui_controller.report_youtube_search_failure)
+        self.ui.sound_file_playback_page.youtube_search_timed.connect(self.gui_controller.report_youtube_search_timing)
         self.gui_controller.playback_status_updated.connect(self.ui.sound_file_playback_page.update_playback_status)
 
         #
@@ -106,6 +121,8 @@ class Gui(QMainWindow):
 
         # Set initial values for date-time label
         self.handle_date_time_update()
+        # Only subscribe to the data feeds of the page shown first
+        self.update_data_feeds()
         # Finally, start the controller
         self.gui_controller.start()
         
@@ -129,6 +146,22 @@ class Gui(QMainWindow):
             GuiUtils.curr_date_time().toString("ddd MMM d, yy\nhh:mm:ss ap")
         )
 
+    ## The callback to pull the latest SCC telemetry and display it.
+    #  @param self The object pointer.
+    def handle_scc_telemetry_available(self):
+        if self.app_is_closing: return
+        msg = self.gui_controller.take_scc_telemetry()
+        if msg is not None:
+            self.ui.screen_color_coordination_page.update_scc_telemetry(msg)
+
+    ## The callback to pull the latest compressed SCC screen image and display it.
+    #  @param self The object pointer.
+    def handle_scc_compressed_image_available(self):
+        if self.app_is_closing: return
+        msg = self.gui_controller.take_scc_compressed_image()
+        if msg is not None:
+            self.ui.screen_color_coordination_page.update_scc_compressed_image(msg)
+
     ## Changes the active stacked page group.
     #  @param self The object pointer.
     #  @param new_index The index in the dropdown menu of the group selected.
@@ -136,6 +169,15 @@ class Gui(QMainWindow):
         if self.app_is_closing or (new_index < 0): return
         self.ui.stacked_page_groups.setCurrentIndex(new_index)
 
+    ## Subscribe to only the data feeds declared by the visible page, so hidden
+    #  pages cost nothing to keep up to date.
+    #  @param self The object pointer.
+    def update_data_feeds(self):
+        if self.app_is_closing: return
+        curr_group = self.ui.stacked_page_groups.currentWidget()
+        curr_page = curr_group.currentWidget() if (None != curr_group) else None
+        self.gui_controller.set_active_data_feeds(getattr(curr_page, "data_feeds", ()))
+
     ## Traverse the given number of pages within the current page group.
     #  @param self The object pointer.
     #  @param diff The number of indices to translate by.
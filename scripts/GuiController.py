@@ -1,18 +1,29 @@
 from sys import argv as sargv
-from math import cos, pi
+from math import pi
+from time import monotonic, time
+from threading import Lock
 from collections import OrderedDict
 
+import numpy as np
+
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
 from rclpy import init as rclpy_init
-from sh_common_interfaces.msg import CountdownState, WaveUpdate, \
-    WaveParticipantLocation, Float32Arr
-from sh_scc_interfaces.msg import ColorPeaksTelem
+from sh_common_interfaces.msg import CountdownState, Float32Arr
 from sh_sfp_interfaces.msg import PlaybackUpdate
 from sh_sfp_interfaces.srv import RequestPlaybackCommand
 
-from scripts import GuiUtils
-from scripts.GuiNode import GuiNode
+from scripts import GuiUtils, Waveforms, WaveFields, WaveParameters
+from scripts.GuiNode import GuiNode, SCC_IMAGE_TRANSPORT_SHM, SCC_TELEMETRY_FEED
+from scripts.ConflatingMailbox import ConflatingMailbox
+from scripts.ShmImageRing import ShmImageRingReader
+from scripts.YouTubeSearch import YouTubeSearchBackend, LocalSearchBackend, CachingSearchBackend, \
+    YOUTUBE_SEARCH_BACKEND_LOCAL
+from scripts.ThumbnailCache import DEFAULT_THUMBNAIL_CACHE_DIRECTORY
+from scripts.ThumbnailLoader import ThumbnailLoader
+from scripts.WaveScheduler import WaveScheduler
+from scripts.WaveParticipantRegistry import WaveParticipantRegistry
+from scripts.WaveUpdateEncoder import WaveUpdateEncoder
 from scripts.YouTubeVideoListing import YouTubeVideoListing
 
 #
@@ -21,6 +32,10 @@ from scripts.YouTubeVideoListing import YouTubeVideoListing
 
 _2PI = 2 * pi
 WAVE_UPDATE_PERIOD_MS = 10
+# Stream every participant's intensity each wave tick
+WAVE_MODE_STREAM = "stream"
+# Broadcast only the wave's parameters and let participants synthesize intensities
+WAVE_MODE_PARAMETRIC = "parametric"
 
 #
 # Class definitions
@@ -43,41 +58,163 @@ class MorningCountdownData(object):
         self.curr_state = None
 
 ## Data needed to update the peripheral devices participating in the wave mode.
+#  Participants are kept in a registry of contiguous buffers of ID's and positions
+#  so that every intensity can be calculated with a single vectorized call. The
+#  wave's location is derived from a monotonic timestamp rather than advanced per
+#  tick, so late or skipped ticks never cause drift. Intensities are looked up in
+#  a precomputed waveform table, indexed by each participant's precomputed table
+#  offset from every source of the wave's field, and superposed by averaging.
 class WaveUpdateData(object):
 
     ## The constructor.
     #  @param self The object pointer.
-    def __init__(self):
-        self.id_location_map = {}
+    #  @param participant_timeout The number of seconds without a response after
+    #  which a participant is evicted, or zero to never evict.
+    def __init__(self, participant_timeout):
+        self.registry = WaveParticipantRegistry(participant_timeout)
+        self.offsets = np.empty((0, 1), dtype=np.int64)
+        self.index_scratch = np.empty((0, 1), dtype=np.int64)
+        self.value_scratch = np.empty((0, 1), dtype=np.float64)
+        self.scratch = np.empty(0, dtype=np.float64)
         self.period = None
+        self.epoch = None
         self.location = 0.0
+        self.waveform = Waveforms.build_waveform_table(Waveforms.SINE)
+        self.field = WaveFields.AngularField()
+        self.lock = Lock()
 
-    ## Helper function to add a participant given its integer ID and location.
+    ## Queue a participant's response, given its integer ID and location, to be
+    #  applied on the next flush. This is safe to call from any thread.
     #  @param self The object pointer.
     #  @param msg The WaveParticipantLocation msg to use to add the participant.
-    def add_participant(self, msg):
-        self.id_location_map[msg.participant_id] = msg.position
-
-    ## Calculate the intensity at the given location.
+    #  @param now The monotonic timestamp, in seconds, it was received at.
+    def add_participant(self, msg, now):
+        self.registry.submit(msg, now)
+
+    ## Recalculate every participant's waveform table offset from every source
+    #  of the field.
+    #  @param self The object pointer.
+    def update_offsets(self):
+        count = self.registry.count
+        self.offsets = self.waveform.indices_of(self.field.phase_offsets(
+            self.registry.coordinates[:count],
+            self.registry.positions[:count]
+        ))
+        self.index_scratch = np.empty(self.offsets.shape, dtype=np.int64)
+        self.value_scratch = np.empty(self.offsets.shape, dtype=np.float64)
+        self.scratch = np.empty(count, dtype=np.float64)
+
+    ## Set the spatial coordinates of a participant.
+    #  @param self The object pointer.
+    #  @param participant_id The integer ID of the participant.
+    #  @param coords The participant's 1D, 2D, or 3D coordinates.
+    def set_participant_coordinates(self, participant_id, coords):
+        with self.lock:
+            if self.registry.set_coordinates(participant_id, coords):
+                self.update_offsets()
+
+    ## Set the field describing how the wave propagates through space.
+    #  @param self The object pointer.
+    #  @param field The AngularField, RadialField, PlanarField, or SuperposedField.
+    def set_field(self, field):
+        with self.lock:
+            self.field = field
+            self.update_offsets()
+
+    ## Apply all queued participant responses in one batch and evict any
+    #  participants that stopped responding.
+    #  @param self The object pointer.
+    #  @param now The current monotonic timestamp, in seconds.
+    #  @return The RegistryFlushResult describing what changed.
+    def flush_participants(self, now):
+        with self.lock:
+            result = self.registry.flush(now)
+            if result.changed():
+                self.update_offsets()
+            return result
+
+    ## Set the revolution period of the wave, keeping the wave's current location
+    #  continuous across the change.
+    #  @param self The object pointer.
+    #  @param period The period, in milliseconds.
+    #  @param now The monotonic timestamp, in seconds, to apply the change at.
+    #  @param waveform An optional WaveformTable to switch to, otherwise the
+    #  current waveform is kept.
+    def set_period(self, period, now, waveform=None):
+        with self.lock:
+            if self.period is not None:
+                self.advance_to(now)
+            if (waveform is not None) and (waveform is not self.waveform):
+                resolution_changed = waveform.resolution != self.waveform.resolution
+                self.waveform = waveform
+                if resolution_changed:
+                    self.update_offsets()
+            self.period = period
+            self.epoch = now - ((self.location / _2PI) * (period / 1000))
+
+    ## Set the wave's location given the time elapsed since the epoch.
+    #  @param self The object pointer.
+    #  @param now The monotonic timestamp, in seconds.
+    def advance_to(self, now):
+        self.location = (((now - self.epoch) * 1000 / self.period) % 1.0) * _2PI
+
+    ## Calculate the intensity at the given angular location, ignoring the field.
     #  @param self The object pointer.
     #  @param other The location to calculate intensity at.
     #  @return The intensity at the other location given the current wave location.
     def calc_intensity_at(self, other):
-        return cos(self.location - other)
-
-    ## Calculate the intensity of each peripheral device at the current time.
-    #  @param self The object pointer.
-    #  @return The WaveUpdate msg containing each intensity and ID's.
-    def consume_intensities(self):
-        if self.period is None: return None
-        msg = WaveUpdate()
-        for pId, pLoc in self.id_location_map.items():
-            msg.participant_ids.append(pId)
-            msg.intensities.data.append(self.calc_intensity_at(self.id_location_map[pId]))
-        self.location += ((WAVE_UPDATE_PERIOD_MS / self.period) * _2PI)
-        while self.location >= _2PI:
-            self.location -= _2PI
-        return msg
+        waveform = self.waveform
+        return waveform.table[(waveform.index_of(self.location) - waveform.index_of(other)) & waveform.mask]
+
+    ## Calculate the intensity of every participant at the current wave location.
+    #  @param self The object pointer.
+    #  @return A view into the scratch buffer holding each participant's intensity.
+    def calc_intensities(self):
+        waveform = self.waveform
+        indices = self.index_scratch
+        np.subtract(waveform.index_of(self.location), self.offsets, out=indices)
+        np.bitwise_and(indices, waveform.mask, out=indices)
+        np.take(waveform.table, indices, out=self.value_scratch)
+        return np.mean(self.value_scratch, axis=1, out=self.scratch)
+
+    ## Serialize the parameters describing the current wave. The epoch is
+    #  converted from the monotonic clock to the wall clock, which participants
+    #  are assumed to be synchronized to.
+    #  @param self The object pointer.
+    #  @param wall_now The current wall-clock timestamp, in seconds.
+    #  @param now The current monotonic timestamp, in seconds.
+    #  @return The serialized parameters, or null if the period is not set.
+    def get_parameters(self, wall_now, now):
+        with self.lock:
+            if self.period is None: return None
+            count = self.registry.count
+            return WaveParameters.encode_wave_parameters(
+                self.period,
+                wall_now - (now - self.epoch),
+                self.waveform,
+                self.field,
+                zip(
+                    self.registry.participant_ids_list,
+                    self.registry.positions[:count].tolist(),
+                    self.registry.coordinates[:count].tolist()
+                )
+            )
+
+    ## Calculate the intensity of each peripheral device at the given time.
+    #  @param self The object pointer.
+    #  @param now The monotonic timestamp, in seconds.
+    #  @param encoder The WaveUpdateEncoder to build the msgs with.
+    #  @return The list of WaveUpdate msgs containing each intensity and ID's,
+    #  empty if there is nothing to send.
+    def consume_intensities(self, now, encoder):
+        with self.lock:
+            if self.period is None: return []
+            self.advance_to(now)
+            return encoder.encode(
+                self.registry.participant_ids_list,
+                self.registry.participant_ids[:self.registry.count],
+                self.calc_intensities()
+            )
 
 ## A class to describe a sound file as it moves through the download, analysis,
 #  etc. pipeline.
@@ -311,10 +448,10 @@ class GuiController(QObject):
 
     ## Emits the current morning countdown state
     countdown_state_updated = pyqtSignal(CountdownState)
-    ## Emits a wave participant response
-    wave_participant_responded = pyqtSignal(WaveParticipantLocation)
-    ## Emits the screen color coordinator's telemetry
-    scc_telemetry_updated = pyqtSignal(ColorPeaksTelem)
+    ## Emits when new screen color coordinator telemetry is waiting in the mailbox
+    scc_telemetry_available = pyqtSignal()
+    ## Emits when a new compressed SCC screen image is waiting in the mailbox
+    scc_compressed_image_available = pyqtSignal()
     ## Emits a signal that a video reuested to be downloaded was confirmed
     audio_download_queue_confirmed = pyqtSignal(dict)
     ## Emits the audio download's latest progress for the corresponding video
@@ -335,9 +472,17 @@ class GuiController(QObject):
         # Local variables
         self.morning_countdown_data = None
         self.wave_update_data = None
+        self.last_wave_participant_probe = 0.0
+        self.scc_telemetry_mailbox = ConflatingMailbox()
+        self.scc_compressed_image_mailbox = ConflatingMailbox()
 
         self.one_hertz_timer = QTimer(parent=self)
-        self.wave_update_timer = QTimer(parent=self)
+        self.wave_scheduler = WaveScheduler(
+            self.wave_mode_update,
+            WAVE_UPDATE_PERIOD_MS,
+            error_callback=self.report_wave_update_failure,
+            parent=self
+        )
 
         self.audio_download_managers = {}
         self.audio_analysis_managers = {}
@@ -346,23 +491,76 @@ class GuiController(QObject):
 
         # Make Qt connections
         self.one_hertz_timer.timeout.connect(self.check_for_countdown_state_update)
-        self.wave_update_timer.timeout.connect(self.wave_mode_update)
+        self.one_hertz_timer.timeout.connect(self.broadcast_wave_parameters)
+        self.one_hertz_timer.timeout.connect(self.probe_wave_participants)
 
         # Init ROS and create node interface
         rclpy_init(args=sargv)
         self.gui_node = GuiNode(self)
+        self.wave_update_encoder = WaveUpdateEncoder(
+            epsilon=self.gui_node.wave_delta_epsilon,
+            keyframe_interval=self.gui_node.wave_keyframe_interval,
+            quantize=self.gui_node.wave_quantize,
+            shard_size=self.gui_node.wave_shard_size
+        )
+        # Where YouTube searches are sent
+        if YOUTUBE_SEARCH_BACKEND_LOCAL == self.gui_node.youtube_search_backend:
+            self.youtube_search_backend = LocalSearchBackend(self.gui_node.youtube_search_local_latency_ms)
+        else:
+            self.youtube_search_backend = YouTubeSearchBackend()
+        if self.gui_node.youtube_search_cache_ttl_s > 0:
+            self.youtube_search_backend = CachingSearchBackend(
+                self.youtube_search_backend,
+                self.gui_node.youtube_search_cache_ttl_s
+            )
+        # Apply the thumbnail cache budgets before any thumbnail is loaded
+        ThumbnailLoader.instance().configure_caches(
+            self.gui_node.thumbnail_memory_cache_bytes,
+            self.gui_node.thumbnail_disk_cache_bytes,
+            self.gui_node.thumbnail_cache_directory or DEFAULT_THUMBNAIL_CACHE_DIRECTORY
+        )
+        ThumbnailLoader.instance().disk_cache_failed.connect(self.report_thumbnail_disk_cache_failure)
+        # The mailboxes holding each pausable data feed's undelivered msgs
+        self.feed_mailboxes = {
+            SCC_TELEMETRY_FEED: (self.scc_telemetry_mailbox, self.scc_compressed_image_mailbox),
+        }
+        # Only read from while the shared memory image transport is in use
+        self.scc_image_ring = None
+        if SCC_IMAGE_TRANSPORT_SHM == self.gui_node.scc_image_transport:
+            self.scc_image_ring = ShmImageRingReader(self.gui_node.scc_shm_ring_name)
+        # The page displaying SCC telemetry, whose counters are logged on stop
+        self.scc_page = None
+
+    ## Set the page displaying SCC telemetry.
+    #  @param self The object pointer.
+    #  @param page The ScreenColorCoordination page.
+    def set_scc_page(self, page):
+        self.scc_page = page
 
     ## Start all peripherals.
     #  @param self The object pointer.
     def start(self):
         self.gui_node.sh_start()
         self.one_hertz_timer.start(1000)
-        self.wave_update_timer.start(WAVE_UPDATE_PERIOD_MS)
+        if WAVE_MODE_STREAM == self.gui_node.wave_mode:
+            self.wave_scheduler.start()
 
     ## Blocking call to stop all peripherals.
     #  @param self The object pointer.
     def stop(self):
-        self.wave_update_timer.stop()
+        self.wave_scheduler.stop()
+        self.gui_node.log_info("Wave scheduler stopped: {0}".format(self.wave_scheduler.stats.summary()))
+        self.gui_node.log_info("Wave publishing: {0}".format(self.wave_update_encoder.summary()))
+        self.gui_node.log_info("SCC telemetry frames: {0}".format(self.scc_telemetry_mailbox.summary()))
+        self.gui_node.log_info("SCC compressed images: {0}".format(self.scc_compressed_image_mailbox.summary()))
+        if self.scc_image_ring is not None:
+            self.gui_node.log_info("SCC shared memory images: {0}".format(self.scc_image_ring.summary()))
+            self.scc_image_ring.close()
+        if self.scc_page is not None:
+            self.gui_node.log_info("SCC display: {0}".format(self.scc_page.summary()))
+        self.gui_node.log_info("Thumbnail caches: {0}".format(ThumbnailLoader.instance().summary()))
+        if isinstance(self.youtube_search_backend, CachingSearchBackend):
+            self.gui_node.log_info("YouTube search cache: {0}".format(self.youtube_search_backend.summary()))
         self.one_hertz_timer.stop()
         self.gui_node.sh_stop()
 
@@ -398,15 +596,82 @@ class GuiController(QObject):
             self.morning_countdown_data.curr_state = next_state
             self.gui_node.log_info("Advanced to CountdownState {0}".format(next_state))
 
-    ## Send updates to the intensity of each peripheral device. If not doing a
-    #  wave, then just skip.
+    ## Accept the latest screen color coordinator telemetry, keeping only the
+    #  newest frame until the GUI takes it. This is called from the ROS thread.
     #  @param self The object pointer.
-    def wave_mode_update(self):
-        if not self.wave_update_data: return
-        msg = self.wave_update_data.consume_intensities()
-        if msg is not None:
+    #  @param msg The ROS color peak calculation telemetry message.
+    def post_scc_telemetry(self, msg):
+        if self.scc_telemetry_mailbox.put(msg):
+            self.scc_telemetry_available.emit()
+
+    ## Take the latest screen color coordinator telemetry, if any.
+    #  @param self The object pointer.
+    #  @return The ROS color peak calculation telemetry message, or null.
+    def take_scc_telemetry(self):
+        return self.scc_telemetry_mailbox.take()
+
+    ## Accept the latest compressed SCC screen image, keeping only the newest
+    #  until the GUI takes it. This is called from the ROS thread.
+    #  @param self The object pointer.
+    #  @param msg The ROS compressed image message.
+    def post_scc_compressed_image(self, msg):
+        if self.scc_compressed_image_mailbox.put(msg):
+            self.scc_compressed_image_available.emit()
+
+    ## Take the latest compressed SCC screen image, if any.
+    #  @param self The object pointer.
+    #  @return The ROS compressed image message, or null.
+    def take_scc_compressed_image(self):
+        return self.scc_compressed_image_mailbox.take()
+
+    ## Subscribe to only the pausable data feeds that a visible page needs. The
+    #  msgs of paused feeds that have not been delivered yet are dropped.
+    #  @param self The object pointer.
+    #  @param feeds The iterable of data feed names needed.
+    def set_active_data_feeds(self, feeds):
+        feeds = set(feeds)
+        for feed in self.gui_node.pausable_feeds():
+            active = feed in feeds
+            self.gui_node.set_feed_active(feed, active)
+            if not active:
+                for mailbox in self.feed_mailboxes.get(feed, ()):
+                    mailbox.clear()
+
+    ## Send the current wave's parameters to all participants. If not doing a
+    #  wave, or streaming intensities instead, then just skip.
+    #  @param self The object pointer.
+    def broadcast_wave_parameters(self):
+        wave_update_data = self.wave_update_data
+        if (not wave_update_data) or (WAVE_MODE_PARAMETRIC != self.gui_node.wave_mode): return
+        now = monotonic()
+        result = wave_update_data.flush_participants(now)
+        self.log_wave_participant_changes(result, wave_update_data.registry.count)
+        params = wave_update_data.get_parameters(time(), now)
+        if params is not None:
+            self.gui_node.send_wave_parameters(params)
+
+    ## Send updates to the intensity of each peripheral device. If not doing a
+    #  wave, then just skip. This is called from the wave scheduler's thread.
+    #  @param self The object pointer.
+    #  @param now The monotonic timestamp, in seconds, of this tick.
+    def wave_mode_update(self, now):
+        # Read once, as the Qt thread may replace or clear it at any time
+        wave_update_data = self.wave_update_data
+        if not wave_update_data: return
+        result = wave_update_data.flush_participants(now)
+        if result.added or result.evicted:
+            self.log_wave_participant_changes(result, wave_update_data.registry.count)
+        for msg in wave_update_data.consume_intensities(now, self.wave_update_encoder):
             self.gui_node.send_wave_update(msg)
 
+    ## Log a wave update tick that failed, after which the wave scheduler keeps
+    #  going. Repeat failures are only counted until a tick succeeds again. This
+    #  is called from the wave scheduler's thread.
+    #  @param self The object pointer.
+    #  @param error The exception the tick raised.
+    def report_wave_update_failure(self, error):
+        self.gui_node.log_err("Wave update failed: {0}: {1}".format(type(error).__name__, error))
+
     #  @param self The object pointer.
     #  @param countdown_state The new countdown state.
     def set_countdown_state(self, countdown_state):
@@ -447,24 +712,75 @@ class GuiController(QObject):
         # Calculate and return the result as well as the current time used
         return curr_date_time, curr_date_time.addSecs((goal_min - curr_min) * 60)
 
+    ## Set the spatial coordinates of a wave participant. If not doing a wave,
+    #  ignore the request.
+    #  @param self The object pointer.
+    #  @param participant_id The integer ID of the participant.
+    #  @param coords The participant's 1D, 2D, or 3D coordinates.
+    def set_wave_participant_coordinates(self, participant_id, coords):
+        if not self.wave_update_data: return
+        self.wave_update_data.set_participant_coordinates(participant_id, coords)
+        self.broadcast_wave_parameters()
+
+    ## Set how the wave propagates through space. If not doing a wave, ignore the
+    #  request.
+    #  @param self The object pointer.
+    #  @param field The AngularField, RadialField, PlanarField, or SuperposedField.
+    def set_wave_field(self, field):
+        if not self.wave_update_data: return
+        self.wave_update_data.set_field(field)
+        self.broadcast_wave_parameters()
+
     ## Handle a response for a peripheral device to participate in the wave. If
-    #  it is not set, ignore the message.
+    #  it is not set, ignore the message. This is called from the ROS thread, and
+    #  responses are only queued here; they are applied in one batch on the next
+    #  wave tick, which also precomputes the participants' waveform table offsets.
     #  @param self The object pointer.
     #  @param msg The ROS msg.
     def add_wave_update_participant(self, msg):
-        if not self.wave_update_data: return
-        self.wave_update_data.add_participant(msg)
-        self.gui_node.log_info("Added participant: [{0},{1}]".format(
-            msg.participant_id, msg.position
-        ))
-
-    ## Set the revolution period of the wave. If it is not set, ignore the
+        wave_update_data = self.wave_update_data
+        if not wave_update_data: return
+        wave_update_data.add_participant(msg, monotonic())
+
+    ## Log a summary of a batch of wave participant changes, if there were any.
+    #  @param self The object pointer.
+    #  @param result The RegistryFlushResult of the batch.
+    #  @param live_count The number of live participants after the batch.
+    def log_wave_participant_changes(self, result, live_count):
+        if result.added or result.evicted:
+            self.gui_node.log_info("Wave participants: added {0}, evicted {1}, {2} live.".format(
+                result.added,
+                result.evicted,
+                live_count
+            ))
+
+    ## Periodically ask peripheral devices to respond to the wave again so that
+    #  live ones are not evicted. If not doing a wave, or eviction is disabled,
+    #  then just skip.
+    #  @param self The object pointer.
+    def probe_wave_participants(self):
+        if (not self.wave_update_data) or (self.gui_node.wave_participant_timeout_ms <= 0): return
+        now = monotonic()
+        if (now - self.last_wave_participant_probe) * 2000 >= self.gui_node.wave_participant_timeout_ms:
+            self.last_wave_participant_probe = now
+            self.gui_node.send_start_wave_mode()
+
+    ## Set the revolution period of the wave, and optionally its shape. The shape
+    #  is precomputed into a lookup table here. If it is not set, ignore the
     #  request.
     #  @param self The object pointer.
     #  @param period The period, in milliseconds.
-    def set_wave_update_period(self, period):
+    #  @param waveform An optional builtin waveform name or user-defined shape
+    #  (see Waveforms.build_waveform_table), otherwise the current one is kept.
+    #  @param width The width of pulse-like shapes, as a fraction of a revolution.
+    def set_wave_update_period(self, period, waveform=None, width=Waveforms.DEFAULT_PULSE_WIDTH):
         if not self.wave_update_data: return
-        self.wave_update_data.period = period
+        self.wave_update_data.set_period(
+            period,
+            monotonic(),
+            None if waveform is None else Waveforms.build_waveform_table(waveform, width=width)
+        )
+        self.broadcast_wave_parameters()
 
     ## Helper function to pass the sound file playback command to the ROS node interface.
     #  @param self The object pointer.
@@ -482,6 +798,38 @@ class GuiController(QObject):
             self.check_for_next_playback(True)
         self.gui_node.send_playback_command(command)
 
+    ## Report a YouTube search that failed.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @param error The error message.
+    def report_youtube_search_failure(self, query, error):
+        self.gui_node.log_warn("YouTube search for '{0}' failed: {1}".format(query, error))
+
+    ## Report an on-disk thumbnail cache that could not be set up.
+    #  @param self The object pointer.
+    #  @param directory The directory of the cache.
+    #  @param error The error message.
+    def report_thumbnail_disk_cache_failure(self, directory, error):
+        self.gui_node.log_warn("Thumbnail disk cache in '{0}' unavailable, caching in memory only: {1}".format(
+            directory,
+            error
+        ))
+
+    ## Report how long a YouTube search took to show.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @param result_count The number of results in the first page.
+    #  @param first_result_ms The time to the first result being shown, in ms.
+    #  @param all_thumbnails_ms The time to every visible thumbnail being shown, in ms.
+    def report_youtube_search_timing(self, query, result_count, first_result_ms, all_thumbnails_ms):
+        self.gui_node.log_info(
+            "YouTube search for '{0}' showed a page of {1} results: first result {2:.0f} ms, all thumbnails {3:.0f} ms.".format(
+                query,
+                result_count,
+                first_result_ms,
+                all_thumbnails_ms
+        ))
+
     ## Handle the user's request to queue a new YouTube video for sound file playback.
     #  If the listing is not set, simply ignore the request.
     #  @param self The object pointer.
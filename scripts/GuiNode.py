@@ -3,7 +3,9 @@ from PyQt5.QtCore import QThread
 from rclpy import spin as rclpy_spin, shutdown as rclpy_shutdown
 from rclpy.node import Node
 from rclpy.action import ActionClient
-from std_msgs.msg import Empty, Float32
+from rclpy.qos import QoSProfile, DurabilityPolicy
+from std_msgs.msg import Empty, Float32, String
+from sensor_msgs.msg import CompressedImage, Image
 
 from scripts import GuiUtils
 
@@ -20,6 +22,33 @@ from sh_sfp_interfaces.msg import OnsetDetectionAlgorithms, \
 
 MAX_AUX_DEVICE_COUNT = 32
 
+#
+# Global functions
+#
+
+## Get the queue depth to use for the wave topics, deep enough to hold a burst
+#  of one msg per participant, such as the join replies to a wave starting or the
+#  shards of one wave update.
+#  @param max_participant_count The max number of wave participants expected.
+#  @return The queue depth.
+def wave_queue_depth(max_participant_count):
+    return max(MAX_AUX_DEVICE_COUNT, max_participant_count)
+
+# The topic that wave parameters are broadcast on in parametric wave mode
+WAVE_PARAMETERS_TOPIC = "/smart_home/wave_parameters"
+
+# Take the SCC screen image from the raw image inside the color peaks telemetry
+SCC_IMAGE_TRANSPORT_RAW = "raw"
+# Take the SCC screen image from a separate compressed image stream
+SCC_IMAGE_TRANSPORT_COMPRESSED = "compressed"
+# Take the SCC screen image from a shared memory ring on this host, as referenced
+# by the color peaks telemetry, falling back to the telemetry's raw image
+SCC_IMAGE_TRANSPORT_SHM = "shm"
+
+# The data feed of SCC telemetry and screen images, which pages showing them
+# declare so it is only subscribed to while one of them is visible
+SCC_TELEMETRY_FEED = "scc_telemetry"
+
 #
 # Class definitions
 #
@@ -51,6 +80,52 @@ class GuiNode(HeartbeatNode):
     def __init__(self, qt_parent):
         super(GuiNode, self).__init__("sh_gui")
 
+        #
+        # ROS parameters
+        #
+
+        # The min change in a participant's intensity to publish, zero to always publish full frames
+        self.wave_delta_epsilon = self.declare_parameter("wave_delta_epsilon", 0.0).value
+        # The max number of wave updates between full keyframes when delta publishing
+        self.wave_keyframe_interval = self.declare_parameter("wave_keyframe_interval", 100).value
+        # Whether or not to quantize wave intensities to 8-bit levels
+        self.wave_quantize = self.declare_parameter("wave_quantize", False).value
+        # Either "stream" to publish intensities every tick, or "parametric" to
+        # broadcast only the wave's parameters
+        self.wave_mode = self.declare_parameter("wave_mode", "stream").value
+        # The time without a response after which a wave participant is evicted, zero to never evict
+        self.wave_participant_timeout_ms = self.declare_parameter("wave_participant_timeout_ms", 10000).value
+        # The max number of participants per wave update msg, zero to always send one msg
+        self.wave_shard_size = self.declare_parameter("wave_shard_size", MAX_AUX_DEVICE_COUNT).value
+        # The max number of wave participants expected, which sizes the wave topics' queues
+        self.wave_max_participant_count = self.declare_parameter(
+            "wave_max_participant_count",
+            MAX_AUX_DEVICE_COUNT
+        ).value
+        # Either "raw", "compressed", or "shm", where the SCC screen image is taken from
+        self.scc_image_transport = self.declare_parameter("scc_image_transport", SCC_IMAGE_TRANSPORT_RAW).value
+        # The topic of the compressed SCC screen image stream
+        self.scc_compressed_image_topic = self.declare_parameter(
+            "scc_compressed_image_topic",
+            sh_common_constants.topics.COLOR_PEAKS_TELEM + "/image/compressed"
+        ).value
+        # The name of the shared memory ring of SCC screen images
+        self.scc_shm_ring_name = self.declare_parameter("scc_shm_ring_name", "sh_scc_image_ring").value
+        # Either "youtube" or "local", where YouTube searches are sent
+        self.youtube_search_backend = self.declare_parameter("youtube_search_backend", "youtube").value
+        # How long the local search backend takes to answer, for testing
+        self.youtube_search_local_latency_ms = self.declare_parameter("youtube_search_local_latency_ms", 500).value
+        # How long YouTube search results are cached for, zero to not cache them
+        self.youtube_search_cache_ttl_s = self.declare_parameter("youtube_search_cache_ttl_s", 300.0).value
+        # Whether to search YouTube as the user types, and how long typing must pause for first
+        self.youtube_search_as_you_type = self.declare_parameter("youtube_search_as_you_type", False).value
+        self.youtube_search_debounce_ms = self.declare_parameter("youtube_search_debounce_ms", 300).value
+        # The max total sizes of the in-memory and on-disk thumbnail caches, zero to disable either
+        self.thumbnail_memory_cache_bytes = self.declare_parameter("thumbnail_memory_cache_bytes", 32 * 1024 * 1024).value
+        self.thumbnail_disk_cache_bytes = self.declare_parameter("thumbnail_disk_cache_bytes", 64 * 1024 * 1024).value
+        # The directory of the on-disk thumbnail cache, empty for the default
+        self.thumbnail_cache_directory = self.declare_parameter("thumbnail_cache_directory", "").value
+
         #
         # ROS publishers
         #
@@ -79,10 +154,19 @@ class GuiNode(HeartbeatNode):
             1
         )
 
+        # Created once, as a new publisher would have to be discovered again and
+        # the keyframe sent right after a participant change would be lost
         self.wave_update_pub = self.create_publisher(
             WaveUpdate,
             sh_common_constants.topics.WAVE_UPDATES,
-            MAX_AUX_DEVICE_COUNT
+            wave_queue_depth(self.wave_max_participant_count)
+        )
+
+        # Transient local so participants joining late still get the latest parameters
+        self.wave_parameters_pub = self.create_publisher(
+            String,
+            WAVE_PARAMETERS_TOPIC,
+            QoSProfile(depth=1, durability=DurabilityPolicy.TRANSIENT_LOCAL)
         )
 
         #
@@ -100,15 +184,25 @@ class GuiNode(HeartbeatNode):
             WaveParticipantLocation,
             sh_common_constants.topics.WAVE_PARTICIPANT_LOCATION,
             self.participant_location_callback,
-            MAX_AUX_DEVICE_COUNT
+            wave_queue_depth(self.wave_max_participant_count)
         )
 
-        self.color_peaks_telem_sub = self.create_subscription(
-            ColorPeaksTelem,
-            sh_common_constants.topics.COLOR_PEAKS_TELEM,
-            self.scc_telemetry_callback,
-            1
-        )
+        self.color_peaks_telem_sub = None
+        self.scc_compressed_image_sub = None
+        self.create_scc_subs()
+
+        # The subscriptions only needed while a page showing their data is
+        # visible, by data feed, as functions to create and destroy them
+        self.feed_subs = {
+            SCC_TELEMETRY_FEED: (self.create_scc_subs, self.destroy_scc_subs),
+        }
+        # The feeds requested, replaced whole by whichever thread pauses or
+        # resumes them, and the feeds subscribed to, only touched while spinning
+        self.active_feeds = frozenset(self.feed_subs)
+        self.subscribed_feeds = set(self.feed_subs)
+        # Subscriptions are only created and destroyed on the spinning thread,
+        # once woken up through this
+        self.feed_change_guard = self.create_guard_condition(self.apply_feed_changes)
 
         #
         # ROS service clients
@@ -184,6 +278,67 @@ class GuiNode(HeartbeatNode):
     def log_fatal(self, smsg):
         self.get_logger().fatal(smsg)
 
+    ## Create the SCC telemetry subscriber and, if the compressed image stream is
+    #  in use, the compressed image subscriber.
+    #  @param self The object pointer.
+    def create_scc_subs(self):
+        self.color_peaks_telem_sub = self.create_subscription(
+            ColorPeaksTelem,
+            sh_common_constants.topics.COLOR_PEAKS_TELEM,
+            self.scc_telemetry_callback,
+            1
+        )
+        if SCC_IMAGE_TRANSPORT_COMPRESSED == self.scc_image_transport:
+            self.scc_compressed_image_sub = self.create_subscription(
+                CompressedImage,
+                self.scc_compressed_image_topic,
+                self.scc_compressed_image_callback,
+                1
+            )
+
+    ## Destroy the SCC telemetry and compressed image subscribers.
+    #  @param self The object pointer.
+    def destroy_scc_subs(self):
+        self.destroy_subscription(self.color_peaks_telem_sub)
+        self.color_peaks_telem_sub = None
+        if self.scc_compressed_image_sub is not None:
+            self.destroy_subscription(self.scc_compressed_image_sub)
+            self.scc_compressed_image_sub = None
+
+    ## Get the data feeds whose subscriptions can be paused.
+    #  @param self The object pointer.
+    #  @return The iterable of data feed names.
+    def pausable_feeds(self):
+        return self.feed_subs.keys()
+
+    ## Pause or resume a data feed's subscriptions. The msgs of a paused feed are
+    #  dropped in its callbacks right away, and its subscriptions are destroyed,
+    #  or created again, on the spinning thread soon after. This must be called
+    #  from the same thread each time.
+    #  @param self The object pointer.
+    #  @param feed The name of the data feed.
+    #  @param active Whether the feed should be subscribed to.
+    def set_feed_active(self, feed, active):
+        if active == (feed in self.active_feeds): return
+        self.active_feeds = (self.active_feeds | {feed}) if active else (self.active_feeds - {feed})
+        self.feed_change_guard.trigger()
+
+    ## Create or destroy the subscriptions of the data feeds that were resumed or
+    #  paused since the last call. This is called from the spinning thread.
+    #  @param self The object pointer.
+    def apply_feed_changes(self):
+        active_feeds = self.active_feeds
+        for feed, (create_subs, destroy_subs) in self.feed_subs.items():
+            active = feed in active_feeds
+            if active == (feed in self.subscribed_feeds): continue
+            if active:
+                create_subs()
+                self.subscribed_feeds.add(feed)
+            else:
+                destroy_subs()
+                self.subscribed_feeds.discard(feed)
+            self.log_info("{0} data feed {1}.".format("Resumed" if active else "Paused", feed))
+
     ## With the node already configured, do any startup operations.
     #  @param self The object pointer.
     def sh_start(self):
@@ -213,13 +368,25 @@ class GuiNode(HeartbeatNode):
     #  @param self The object pointer.
     #  @param msg The ROS message describing an appliance participating in the wave along with its location.
     def participant_location_callback(self, msg):
-        self.qt_parent.wave_participant_responded.emit(msg)
+        self.qt_parent.add_wave_update_participant(msg)
     
     ## Callback to update the telemetry from the color preak calculation pipeline.
     #  @param self The object pointer.
     #  @param msg The ROS color peak calculation telemetry message.
     def scc_telemetry_callback(self, msg):
-        self.qt_parent.scc_telemetry_updated.emit(msg)
+        if SCC_TELEMETRY_FEED not in self.active_feeds: return
+        # The screen image comes from the compressed stream instead, so let the
+        # raw one be freed right away rather than held onto until it is displayed
+        if SCC_IMAGE_TRANSPORT_COMPRESSED == self.scc_image_transport:
+            msg.image = Image()
+        self.qt_parent.post_scc_telemetry(msg)
+
+    ## Callback to update the compressed SCC screen image.
+    #  @param self The object pointer.
+    #  @param msg The ROS compressed image message.
+    def scc_compressed_image_callback(self, msg):
+        if SCC_TELEMETRY_FEED not in self.active_feeds: return
+        self.qt_parent.post_scc_compressed_image(msg)
     
     ## Update the individual control intensity.
     #  @param self The object pointer.
@@ -239,12 +406,23 @@ class GuiNode(HeartbeatNode):
         self.countdown_state_pub.publish(countdown_state_msg)
         self.log_info("Set countdown state to [{0}].".format(state))
     
+    ## Ask peripheral devices to participate in the wave mode.
+    #  @param self The object pointer.
+    def send_start_wave_mode(self):
+        self.start_wave_mode_pub.publish(Empty())
+
     ## Update the wave mode intensities.
     #  @param self The object pointer.
     #  @param msg The collection of intensities with their corresponding participant ID's.
     def send_wave_update(self, msg):
         self.wave_update_pub.publish(msg)
 
+    ## Broadcast the wave mode parameters.
+    #  @param self The object pointer.
+    #  @param params The serialized wave parameters.
+    def send_wave_parameters(self, params):
+        self.wave_parameters_pub.publish(String(data=params))
+
     ## Publish the given ROS msg playback command.
     #  @param self The object pointer.
     #  @param command The playback command to issue.
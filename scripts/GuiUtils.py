@@ -1,11 +1,14 @@
 from os.path import join as ojoin
+from sys import byteorder as sys_byteorder
+from collections import OrderedDict
 
-from PyQt5.QtCore import QTime, QDate, QDateTime
+from PyQt5.QtCore import Qt, QTime, QDate, QDateTime
 from PyQt5.QtGui import QPalette, QColor, QImage, QPixmap
 
 from rclpy.duration import Duration
 from ament_index_python.packages import get_package_share_directory
 from cv_bridge import CvBridge
+from sensor_msgs.msg import CompressedImage
 
 #
 # Constants
@@ -19,10 +22,85 @@ TRAFFIC_LIGHT_IMAGE_HEIGHT = 500
 COLOR_PEAK_COLOR_PREVIEW_IMAGE_HEIGHT = 200
 COLOR_PEAK_COLOR_PREVIEW_IMAGE_WIDTH = 200
 
+SCC_SCREEN_IMAGE_MAX_WIDTH = 1200
+SCC_SCREEN_IMAGE_MAX_HEIGHT = 600
+
+# The number of YouTube search results fetched per page
 YOUTUBE_SEARCH_RESULT_COUNT = 10
+# The number of search result rows kept built below the bottom of the view
+YOUTUBE_SEARCH_LOOKAHEAD_ROWS = 3
+
+YOUTUBE_THUMBNAIL_HEIGHT = 150
+# The size and gray level of the swatch shown until a thumbnail has loaded
+YOUTUBE_THUMBNAIL_PLACEHOLDER_WIDTH = 267
+YOUTUBE_THUMBNAIL_PLACEHOLDER_GRAY = 48
+
+# The max number of solid color swatch pixmaps to keep cached
+SWATCH_CACHE_CAPACITY = 512
 
 CV_BRIDGE = CvBridge()
 
+# The encoding to assume for ROS images that do not specify one
+DEFAULT_ROS_IMAGE_ENCODING = "bgr8"
+
+# The QImage format with the same memory layout as each supported ROS image encoding
+ROS_ENCODING_QIMAGE_FORMATS = {
+    "rgb8": QImage.Format_RGB888,
+    "bgr8": QImage.Format_BGR888,
+    "rgba8": QImage.Format_RGBA8888,
+    "mono8": QImage.Format_Grayscale8,
+    "8UC1": QImage.Format_Grayscale8,
+    "mono16": QImage.Format_Grayscale16,
+    "16UC1": QImage.Format_Grayscale16,
+}
+# The QImage format of each single-channel CvBridge image dtype, for encodings
+# that are converted through CvBridge without being made color
+CV_DTYPE_QIMAGE_FORMATS = {
+    "uint8": QImage.Format_Grayscale8,
+    "uint16": QImage.Format_Grayscale16,
+}
+# ARGB32 is laid out as B,G,R,A only on little-endian hosts, and no QImage format
+# matches bgra8 on big-endian ones, so it is converted through CvBridge there
+if sys_byteorder == "little":
+    ROS_ENCODING_QIMAGE_FORMATS["bgra8"] = QImage.Format_ARGB32
+
+#
+# Class definitions
+#
+
+## A least-recently-used cache of solid color pixmaps keyed by (width, height, r, g, b).
+class SwatchCache(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param capacity The max number of pixmaps to keep.
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.pixmaps = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    ## Get the pixmap for the given key, painting and caching it if needed.
+    #  @param self The object pointer.
+    #  @param key The tuple of (width, height, r, g, b).
+    #  @return The QPixmap.
+    def get(self, key):
+        pm = self.pixmaps.get(key)
+        if pm is not None:
+            self.pixmaps.move_to_end(key)
+            self.hits += 1
+            return pm
+        self.misses += 1
+        w, h, r, g, b = key
+        pm = QPixmap(w, h)
+        pm.fill(QColor(r, g, b))
+        self.pixmaps[key] = pm
+        if len(self.pixmaps) > self.capacity:
+            self.pixmaps.popitem(last=False)
+        return pm
+
+SWATCH_CACHE = SwatchCache(SWATCH_CACHE_CAPACITY)
+
 #
 # Global functions
 #
@@ -39,33 +117,136 @@ def get_asset_url(*url_components):
 def get_image_url(*url_components):
     return get_asset_url("images", *url_components)
 
-## Given a ROS img message, get a corresponding QPixmap.
-#  @warning Assumes BGR8 image format.
-#  @param img_ros The ROS image message
+## Check whether a ROS image encoding has a single channel, e.g. mono16 or 32FC1.
+#  @param encoding The ROS image encoding.
+#  @return True if the encoding has a single channel.
+def is_single_channel_encoding(encoding):
+    return encoding.startswith("mono") or encoding.endswith("C1")
+
+## Check whether a buffer holds enough bytes for an image with the given rows.
+#  @param data The image buffer, as any object supporting the buffer protocol.
+#  @param height The height of the image, in pixels.
+#  @param step The row stride of the image, in bytes.
+#  @return True if the buffer is long enough to wrap.
+def is_buffer_large_enough(data, height, step):
+    return memoryview(data).nbytes >= (height * step)
+
+## Given a ROS img message, get a QImage that wraps the message's data buffer
+#  directly, without copying it. The message's row stride is respected. The data
+#  buffer is kept alive for as long as the QImage is, but must not be modified.
+#  Encodings without a matching QImage format, and 16-bit images whose byte order
+#  differs from this host's, are converted through CvBridge instead: to BGR8 if
+#  they have color, otherwise as they are, in which case only 8-bit and 16-bit
+#  integer channels can be shown.
+#  @param img_ros The ROS image message, which is assumed BGR8 if it has no encoding.
+#  @return The QImage, which is null if the message's data is shorter than its
+#  rows or its encoding cannot be shown.
+def get_qimage_from_rosimg(img_ros):
+    encoding = img_ros.encoding or DEFAULT_ROS_IMAGE_ENCODING
+    if not is_buffer_large_enough(img_ros.data, img_ros.height, img_ros.step):
+        return QImage()
+    fmt = ROS_ENCODING_QIMAGE_FORMATS.get(encoding)
+    if (fmt is None) or ((fmt == QImage.Format_Grayscale16) and (bool(img_ros.is_bigendian) != (sys_byteorder == "big"))):
+        if is_single_channel_encoding(encoding):
+            img_cv = CV_BRIDGE.imgmsg_to_cv2(img_ros, desired_encoding="passthrough")
+            fmt = CV_DTYPE_QIMAGE_FORMATS.get(img_cv.dtype.name)
+            if fmt is None:
+                return QImage()
+        else:
+            img_cv = CV_BRIDGE.imgmsg_to_cv2(img_ros, desired_encoding="bgr8")
+            fmt = QImage.Format_BGR888
+        h, w = img_cv.shape[:2]
+        data = img_cv.data
+        qimg = QImage(data, w, h, img_cv.strides[0], fmt)
+    else:
+        data = img_ros.data
+        qimg = QImage(data, img_ros.width, img_ros.height, img_ros.step, fmt)
+    qimg.ros_data = data
+    return qimg
+
+## Given a raw image buffer laid out like a ROS img message's data, get a QImage
+#  that wraps it directly, without copying it. The buffer must outlive the QImage
+#  and must not be modified while it is in use.
+#  @param data The image buffer, as any object supporting the buffer protocol.
+#  @param width The width of the image, in pixels.
+#  @param height The height of the image, in pixels.
+#  @param step The row stride of the image, in bytes.
+#  @param encoding The ROS image encoding of the buffer, with 16-bit channels in
+#  this host's byte order.
+#  @return The QImage, or null if the encoding has no matching QImage format or
+#  the buffer is shorter than the image's rows.
+def get_qimage_from_buffer(data, width, height, step, encoding):
+    fmt = ROS_ENCODING_QIMAGE_FORMATS.get(encoding)
+    if (fmt is None) or (not is_buffer_large_enough(data, height, step)):
+        return None
+    qimg = QImage(data, width, height, step, fmt)
+    qimg.ros_data = data
+    return qimg
+
+## Given a ROS compressed img message, decode it into a QImage.
+#  @param img_ros The ROS compressed image message, in any format Qt can decode
+#  (e.g. JPEG or PNG).
+#  @return The QImage, which is null if decoding failed.
+def get_qimage_from_compressed_rosimg(img_ros):
+    return QImage.fromData(bytes(img_ros.data))
+
+## Given a raw or compressed ROS img message, get a QImage that owns its own data,
+#  scaled down to fit the given size if it is any larger. This does not touch any
+#  QPixmap, so it is safe to call off the Qt main thread.
+#  @param img_ros The ROS image message, which is assumed BGR8 if it has no
+#  encoding, or ROS compressed image message.
+#  @param target_size The QSize to fit within, or null to keep the native size.
+#  @param aspect_mode How to treat the aspect ratio when scaling.
+#  @return The QImage.
+def get_scaled_qimage_from_rosimg(img_ros, target_size, aspect_mode=Qt.KeepAspectRatio):
+    if isinstance(img_ros, CompressedImage):
+        qimg = get_qimage_from_compressed_rosimg(img_ros)
+    else:
+        qimg = get_qimage_from_rosimg(img_ros)
+    return get_scaled_qimage(qimg, target_size, aspect_mode)
+
+## Given a QImage, get one that owns its own data, scaled down to fit the given
+#  size if it is any larger. This is the only copy made of the input's pixels.
+#  @param qimg The QImage, which may wrap a buffer it does not own.
+#  @param target_size The QSize to fit within, or null to keep the native size.
+#  @param aspect_mode How to treat the aspect ratio when scaling.
+#  @return The QImage.
+def get_scaled_qimage(qimg, target_size, aspect_mode=Qt.KeepAspectRatio):
+    if (target_size is not None) and (
+        (Qt.IgnoreAspectRatio == aspect_mode)
+        or (qimg.width() > target_size.width())
+        or (qimg.height() > target_size.height())
+    ):
+        return qimg.scaled(target_size, aspect_mode, Qt.SmoothTransformation)
+    return qimg.copy()
+
+## Given a ROS img message, get a corresponding QPixmap. The only copy made is
+#  the upload into the QPixmap itself.
+#  @param img_ros The ROS image message, which is assumed BGR8 if it has no encoding.
 #  @return The QPixmap.
 def get_qpixmap_from_rosimg(img_ros):
-    img_cv = CV_BRIDGE.imgmsg_to_cv2(img_ros)
-    h, w, _ = img_cv.shape
-    return QPixmap.fromImage(QImage(img_cv.data, w, h, 3*w, QImage.Format_BGR888))
+    return QPixmap.fromImage(get_qimage_from_rosimg(img_ros))
 
-## Fill the given label to the given RGB and intensity.
+## Fill the given label to the given RGB and intensity. Scaling the HSV value
+#  while keeping hue and saturation is the same as scaling each RGB channel, so
+#  the color is quantized straight to 8-bit channels. Solid pixmaps are shared
+#  through SWATCH_CACHE, and the label is left untouched if its size and
+#  quantized color have not changed since it was last filled.
 #  @param lbl The label widget to paint.
 #  @param r The red channel of the color.
 #  @param g The green channel of the color.
 #  @param b The blue channel of the color.
 #  @param intensity The intensity of the given color (is treated as 100% if unspecified).
 def color_label(lbl, r, g, b, intensity=None):
-    color = QColor(r,g,b)
-    if intensity is not None:
-        if (intensity >= 0) and (intensity <= 1):
-            color.setHsv(
-                color.hue(),
-                color.saturation(),
-                color.value() * intensity
-            )
-    pm = QPixmap(lbl.size())
-    pm.fill(color)
-    lbl.setPixmap(pm)
+    if (intensity is not None) and (intensity >= 0) and (intensity <= 1):
+        r = int((r * intensity) + 0.5)
+        g = int((g * intensity) + 0.5)
+        b = int((b * intensity) + 0.5)
+    size = lbl.size()
+    key = (size.width(), size.height(), r, g, b)
+    if getattr(lbl, "swatch_key", None) != key:
+        lbl.swatch_key = key
+        lbl.setPixmap(SWATCH_CACHE.get(key))
 
 ## Helper function to get the current time.
 #  @return The current time.
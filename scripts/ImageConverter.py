@@ -0,0 +1,134 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from scripts import GuiUtils, ShmImageRing
+
+#
+# Class definitions
+#
+
+## A task to convert or decode, and if needed scale, a raw or compressed ROS
+#  image msg on a pool thread.
+class ImageConversionTask(QRunnable):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param converter The ImageConverter to report the result to.
+    #  @param img_ros The ROS image message.
+    #  @param target_size The QSize to scale to, or null to keep the native size.
+    #  @param aspect_mode How to treat the aspect ratio when scaling.
+    #  @param context Any object to hand back along with the result.
+    def __init__(self, converter, img_ros, target_size, aspect_mode, context):
+        super(ImageConversionTask, self).__init__()
+        self.converter = converter
+        self.img_ros = img_ros
+        self.target_size = target_size
+        self.aspect_mode = aspect_mode
+        self.context = context
+
+    ## Do the conversion and hand the result back to the converter's thread, as a
+    #  null image if it failed, so the converter is always freed up for the next.
+    #  @param self The object pointer.
+    def run(self):
+        try:
+            qimg = self.converter.convert(self.img_ros, self.target_size, self.aspect_mode)
+        except Exception:
+            # Only one conversion is in flight at a time, so nothing else writes this
+            self.converter.failed_count += 1
+            qimg = QImage()
+        self.converter.converted.emit(qimg, self.context)
+
+## Converts raw and compressed ROS image msgs into display-ready QImages off the
+#  Qt main thread. At most one conversion is in flight at a time; frames
+#  submitted meanwhile are conflated so only the newest is converted next.
+class ImageConverter(QObject):
+
+    #
+    # Qt Signal(s)
+    #
+
+    ## Emits a converted image, from a pool thread, with its submitted context
+    converted = pyqtSignal(QImage, object)
+    ## Emits a display-ready image, on this object's thread, with its submitted context
+    image_ready = pyqtSignal(QImage, object)
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param parent This object's optional Qt parent.
+    def __init__(self, parent=None):
+        super(ImageConverter, self).__init__(parent)
+        # Local variable(s)
+        self.busy = False
+        self.pending = None
+        self.dropped_count = 0
+        self.failed_count = 0
+        # The shared memory image ring that slot references are resolved through, if any
+        self.image_ring = None
+        # Make Qt connections
+        self.converted.connect(self.handle_converted)
+
+    ## Submit a ROS image msg to be converted. Must be called from this object's thread.
+    #  @param self The object pointer.
+    #  @param img_ros The ROS image message.
+    #  @param target_size The QSize to scale to, or null to keep the native size.
+    #  @param aspect_mode How to treat the aspect ratio when scaling.
+    #  @param context Any object to hand back along with the result.
+    def submit(self, img_ros, target_size=None, aspect_mode=Qt.KeepAspectRatio, context=None):
+        if self.busy:
+            if self.pending is not None:
+                self.dropped_count += 1
+            self.pending = (img_ros, target_size, aspect_mode, context)
+        else:
+            self.start(img_ros, target_size, aspect_mode, context)
+
+    ## Convert, and if needed scale, a ROS image msg. Images referring to a shared
+    #  memory ring slot are read straight from the ring, falling back to the
+    #  message's own data if the ring or the frame is no longer available. This
+    #  is called from a pool thread.
+    #  @param self The object pointer.
+    #  @param img_ros The ROS image message.
+    #  @param target_size The QSize to scale to, or null to keep the native size.
+    #  @param aspect_mode How to treat the aspect ratio when scaling.
+    #  @return The QImage, which is null if there was nothing to convert.
+    def convert(self, img_ros, target_size, aspect_mode):
+        if ShmImageRing.is_slot_reference(img_ros):
+            image_ring = self.image_ring
+            qimg = image_ring.get_scaled_qimage(img_ros, target_size, aspect_mode) if (image_ring is not None) else None
+            if qimg is not None:
+                return qimg
+            if not img_ros.data:
+                return QImage()
+        return GuiUtils.get_scaled_qimage_from_rosimg(img_ros, target_size, aspect_mode)
+
+    ## Start converting a ROS image msg on the global thread pool.
+    #  @param self The object pointer.
+    #  @param img_ros The ROS image message.
+    #  @param target_size The QSize to scale to, or null to keep the native size.
+    #  @param aspect_mode How to treat the aspect ratio when scaling.
+    #  @param context Any object to hand back along with the result.
+    def start(self, img_ros, target_size, aspect_mode, context):
+        self.busy = True
+        QThreadPool.globalInstance().start(
+            ImageConversionTask(self, img_ros, target_size, aspect_mode, context)
+        )
+
+    ## Hand off a finished conversion, then start on the newest pending frame, if
+    #  any. Null images are skipped, unless submitted with a context, which is
+    #  still handed off along with the null image.
+    #  @param self The object pointer.
+    #  @param qimg The converted image.
+    #  @param context The object submitted along with the image.
+    def handle_converted(self, qimg, context):
+        self.busy = False
+        pending = self.pending
+        self.pending = None
+        if pending is not None:
+            self.start(*pending)
+        if qimg.isNull() and (context is None): return
+        self.image_ready.emit(qimg, context)
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        return "dropped={0}, failed={1}".format(self.dropped_count, self.failed_count)
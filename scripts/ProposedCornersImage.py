@@ -1,7 +1,8 @@
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QLabel
 
-from scripts import GuiUtils
+from scripts.ImageConverter import ImageConverter
 
 ## A basic label that emits signals when clicked.
 class ProposedCornersImage(QLabel):
@@ -20,6 +21,9 @@ class ProposedCornersImage(QLabel):
         super(ProposedCornersImage, self).__init__(parent)
         # Local variable(s)
         self.ready = False
+        self.image_converter = ImageConverter(self)
+        # Make Qt connections
+        self.image_converter.image_ready.connect(self.set_from_qimage)
         # Done
         self.show()
 
@@ -30,10 +34,20 @@ class ProposedCornersImage(QLabel):
         if self.ready:
             self.image_clicked.emit(evt.x(), evt.y())
 
-    ## Set this pixel map to the given image.
+    ## Set this pixel map to the given image once it has been converted and
+    #  scaled off the main thread.
     #  @param self The object pointer.
     #  @param msg The ROS msg image.
+    #  @param new_height The height to scale the image to.
+    #  @param new_width The width to scale the image to.
     def set_from_ros_img(self, msg, new_height, new_width):
         self.setFixedSize(new_width, new_height)
-        self.setPixmap(GuiUtils.get_qpixmap_from_rosimg(msg).scaled(new_width, new_height))
+        self.image_converter.submit(msg, QSize(new_width, new_height), Qt.IgnoreAspectRatio)
+
+    ## Set this pixel map to the given already-converted image.
+    #  @param self The object pointer.
+    #  @param qimg The display-ready image.
+    #  @param context Unused.
+    def set_from_qimage(self, qimg, context=None):
+        self.setPixmap(QPixmap.fromImage(qimg))
         self.ready = True
@@ -1,11 +1,17 @@
+from PyQt5.QtCore import QSize
 from PyQt5.QtWidgets import QWidget
 
-from scripts import GuiUtils
+from scripts import GuiUtils, ShmImageRing
+from scripts.GuiNode import SCC_TELEMETRY_FEED
+from scripts.ImageConverter import ImageConverter
 from scripts.Ui_ScreenColorCoordination import Ui_ScreenColorCoordination
 
 ## The page encapsulating the screen homography calibration and color preview.
 class ScreenColorCoordination(QWidget):
 
+    ## The data feeds this page shows, which are paused while it is hidden
+    data_feeds = (SCC_TELEMETRY_FEED,)
+
     ## The constructor.
     #  @param self The object pointer.
     #  @param parent This object's optional Qt parent.
@@ -16,9 +22,32 @@ class ScreenColorCoordination(QWidget):
         self.ui = Ui_ScreenColorCoordination()
         self.ui.setupUi(self)
 
+        # Convert and downsample incoming frames off the main thread
+        self.screen_image_max_size = QSize(
+            GuiUtils.SCC_SCREEN_IMAGE_MAX_WIDTH,
+            GuiUtils.SCC_SCREEN_IMAGE_MAX_HEIGHT
+        )
+        self.image_converter = ImageConverter(self)
+        self.image_converter.image_ready.connect(self.show_scc_telemetry)
+
         # Done
         self.show()
 
+    ## Set the shared memory image ring to read SCC screen images from.
+    #  @param self The object pointer.
+    #  @param image_ring The ShmImageRingReader, or null to only use message data.
+    def set_image_ring(self, image_ring):
+        self.image_converter.image_ring = image_ring
+
+    ## Get a human-readable summary of the display counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        return "conversions: {0}; frames: {1}".format(
+            self.image_converter.summary(),
+            self.ui.screen_image.summary()
+        )
+
     ## Fill the given label to the given color.
     #  @param self The object pointer.
     #  @param lbl The label to paint.
@@ -27,16 +56,39 @@ class ScreenColorCoordination(QWidget):
         r,g,b = color.channels
         GuiUtils.color_label(lbl, r, g, b)
 
-    ## Update the SCC telemetry on the screen
+    ## Update the SCC telemetry on the screen. If the message carries an image,
+    #  or a reference to one in the shared memory ring, everything is updated
+    #  together once the image has been converted, otherwise (e.g. the image
+    #  arrives on the compressed stream instead) immediately.
     #  @param self The object pointer.
-    #  @param corner A ROS color peak telemetry message.
+    #  @param msg A ROS color peak telemetry message.
     def update_scc_telemetry(self, msg):
-        img = msg.image
-        if not img.encoding:
-            img.encoding = "bgr8"
-        self.ui.screen_image.setFixedSize(img.width, img.height)
-        self.ui.screen_image.setPixmap(GuiUtils.get_qpixmap_from_rosimg(img))
+        if msg.image.data or ShmImageRing.is_slot_reference(msg.image):
+            self.image_converter.submit(msg.image, self.screen_image_max_size, context=msg)
+        else:
+            self.show_scc_peaks(msg)
 
+    ## Update the SCC screen image from the compressed image stream once it has
+    #  been decoded.
+    #  @param self The object pointer.
+    #  @param msg A ROS compressed image message.
+    def update_scc_compressed_image(self, msg):
+        self.image_converter.submit(msg, self.screen_image_max_size)
+
+    ## Show the SCC screen image and, if given, the telemetry it came with.
+    #  @param self The object pointer.
+    #  @param qimg The display-ready image.
+    #  @param msg The ROS color peak telemetry message the image came from, or null.
+    def show_scc_telemetry(self, qimg, msg):
+        if not qimg.isNull():
+            self.ui.screen_image.set_image(qimg)
+        if msg is not None:
+            self.show_scc_peaks(msg)
+
+    ## Show the SCC color peaks and clustering telemetry.
+    #  @param self The object pointer.
+    #  @param msg The ROS color peak telemetry message.
+    def show_scc_peaks(self, msg):
         self.set_generic_peak_image(self.ui.left_peak_image, msg.left_current_peak)
         self.set_generic_peak_image(self.ui.right_peak_image, msg.right_current_peak)
 
@@ -0,0 +1,299 @@
+from threading import Lock
+from time import monotonic
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+
+from PyQt5.QtCore import Qt
+from sensor_msgs.msg import Image
+
+from scripts import GuiUtils
+
+#
+# Constants
+#
+
+# The prefix of the image header frame ID that marks an image as a reference to
+# a shared memory ring slot, of the form "shm:<ring name>:<slot>:<sequence>"
+SHM_SLOT_REFERENCE_PREFIX = "shm:"
+
+# Identifies a shared memory block as an image ring of this layout version
+RING_MAGIC = 0x53484952
+RING_VERSION = 1
+
+# The ring header, which is padded out to RING_HEADER_SIZE bytes
+RING_HEADER_DTYPE = np.dtype([
+    ("magic", "<u4"),
+    ("version", "<u4"),
+    ("slot_count", "<u4"),
+    ("slot_capacity", "<u4"),
+])
+RING_HEADER_SIZE = 64
+
+# Each slot's header, which is padded out to SLOT_HEADER_SIZE bytes and followed
+# by the slot's pixel data. The sequence number is written to seq_begin before a
+# frame is written and to seq_end after, so a reader can tell a complete frame
+# from one that is being, or has been, overwritten.
+SLOT_HEADER_DTYPE = np.dtype([
+    ("seq_begin", "<u8"),
+    ("seq_end", "<u8"),
+    ("width", "<u4"),
+    ("height", "<u4"),
+    ("step", "<u4"),
+    ("encoding", "S20"),
+])
+SLOT_HEADER_SIZE = 64
+
+# How long to wait, in seconds, before trying to attach to a missing ring again
+REATTACH_INTERVAL_S = 1.0
+
+#
+# Global functions
+#
+
+## Get the size of one slot in the ring, header included, padded to a multiple
+#  of 64 bytes so each slot's pixel data stays aligned.
+#  @param slot_capacity The max size of one frame, in bytes.
+#  @return The slot size, in bytes.
+def slot_stride(slot_capacity):
+    return SLOT_HEADER_SIZE + (((slot_capacity + 63) // 64) * 64)
+
+## Build the reference to a frame in a shared memory ring slot.
+#  @param name The name of the ring.
+#  @param slot The index of the slot.
+#  @param seq The sequence number of the frame.
+#  @return The reference string.
+def make_slot_reference(name, slot, seq):
+    return "{0}{1}:{2}:{3}".format(SHM_SLOT_REFERENCE_PREFIX, name, slot, seq)
+
+## Parse a reference to a frame in a shared memory ring slot.
+#  @param reference The reference string.
+#  @return A tuple of the ring name, slot index, and sequence number, or null if
+#  the string is not a slot reference.
+def parse_slot_reference(reference):
+    if not reference.startswith(SHM_SLOT_REFERENCE_PREFIX):
+        return None
+    try:
+        name, slot, seq = reference[len(SHM_SLOT_REFERENCE_PREFIX):].rsplit(":", 2)
+        return (name, int(slot), int(seq))
+    except ValueError:
+        return None
+
+## Check whether a ROS img message refers to a shared memory ring slot.
+#  @param img_ros The ROS image message.
+#  @return Whether or not the image is a slot reference.
+def is_slot_reference(img_ros):
+    return isinstance(img_ros, Image) and img_ros.header.frame_id.startswith(SHM_SLOT_REFERENCE_PREFIX)
+
+#
+# Class definitions
+#
+
+## A ring of fixed-size image slots in a POSIX shared memory block, for handing
+#  frames between processes on the same host without copying them through DDS.
+#  This holds the views shared by the writer and the reader.
+class ShmImageRing(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param shm The SharedMemory block holding the ring.
+    def __init__(self, shm):
+        self.shm = shm
+        self.name = shm.name
+        self.header = np.ndarray((), dtype=RING_HEADER_DTYPE, buffer=shm.buf)
+        self.slot_count = int(self.header["slot_count"])
+        self.slot_capacity = int(self.header["slot_capacity"])
+        self.stride = slot_stride(self.slot_capacity)
+        self.slot_headers = [
+            np.ndarray((), dtype=SLOT_HEADER_DTYPE, buffer=shm.buf, offset=self.slot_offset(slot))
+            for slot in range(self.slot_count)
+        ]
+
+    ## Get the offset of a slot in the shared memory block.
+    #  @param self The object pointer.
+    #  @param slot The index of the slot.
+    #  @return The offset of the slot's header, in bytes.
+    def slot_offset(self, slot):
+        return RING_HEADER_SIZE + (slot * self.stride)
+
+    ## Get a view of a slot's pixel data.
+    #  @param self The object pointer.
+    #  @param slot The index of the slot.
+    #  @param size The number of bytes to view.
+    #  @return The memoryview.
+    def slot_data(self, slot, size):
+        start = self.slot_offset(slot) + SLOT_HEADER_SIZE
+        return self.shm.buf[start:start + size]
+
+    ## Drop all views of, and detach from, the shared memory block.
+    #  @param self The object pointer.
+    def close(self):
+        self.header = None
+        self.slot_headers = []
+        self.shm.close()
+
+## The producer's side of a shared memory image ring. Frames are written to the
+#  slots round-robin, each under a new sequence number.
+class ShmImageRingWriter(ShmImageRing):
+
+    ## The constructor, which creates the ring, replacing any stale one left
+    #  behind under the same name.
+    #  @param self The object pointer.
+    #  @param name The name of the ring.
+    #  @param slot_count The number of slots in the ring.
+    #  @param slot_capacity The max size of one frame, in bytes.
+    def __init__(self, name, slot_count, slot_capacity):
+        size = RING_HEADER_SIZE + (slot_count * slot_stride(slot_capacity))
+        try:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((), dtype=RING_HEADER_DTYPE, buffer=shm.buf)
+        header["slot_count"] = slot_count
+        header["slot_capacity"] = slot_capacity
+        header["version"] = RING_VERSION
+        header["magic"] = RING_MAGIC
+        del header
+        super(ShmImageRingWriter, self).__init__(shm)
+        self.seq = 0
+
+    ## Write a frame into the next slot.
+    #  @param self The object pointer.
+    #  @param data The frame's pixel data, as any object supporting the buffer protocol.
+    #  @param width The width of the frame, in pixels.
+    #  @param height The height of the frame, in pixels.
+    #  @param step The row stride of the frame, in bytes.
+    #  @param encoding The ROS image encoding of the frame.
+    #  @return A ROS img message describing the frame, with no data of its own and
+    #  a reference to the slot as its header frame ID.
+    def write(self, data, width, height, step, encoding):
+        src = memoryview(data).cast("B")
+        size = height * step
+        assert (src.nbytes >= size), "Frame data is smaller than its dimensions"
+        assert (size <= self.slot_capacity), "Frame does not fit in a ring slot"
+        self.seq += 1
+        slot = self.seq % self.slot_count
+        slot_header = self.slot_headers[slot]
+        slot_header["seq_begin"] = self.seq
+        self.slot_data(slot, size)[:] = src[:size]
+        slot_header["width"] = width
+        slot_header["height"] = height
+        slot_header["step"] = step
+        slot_header["encoding"] = encoding.encode()
+        slot_header["seq_end"] = self.seq
+
+        img_ros = Image(width=width, height=height, step=step, encoding=encoding)
+        img_ros.header.frame_id = make_slot_reference(self.name, slot, self.seq)
+        return img_ros
+
+    ## Detach from and remove the ring.
+    #  @param self The object pointer.
+    def close(self):
+        super(ShmImageRingWriter, self).close()
+        self.shm.unlink()
+
+## The consumer's side of a shared memory image ring. The ring is attached to
+#  lazily, and again after it goes missing, so the producer may start after the
+#  GUI. A frame is only accepted if its slot still holds it, complete, both
+#  before and after it has been copied out.
+class ShmImageRingReader(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param name The name of the ring.
+    def __init__(self, name):
+        self.name = name
+        self.lock = Lock()
+        self.ring = None
+        self.next_attach_time = 0.0
+        self.hit_count = 0
+        self.stale_count = 0
+        self.unavailable_count = 0
+
+    ## Attach to the ring, if not already attached, retrying at most once every
+    #  REATTACH_INTERVAL_S. Must be called with the lock held.
+    #  @param self The object pointer.
+    #  @return The ShmImageRing, or null if it is unavailable.
+    def attach(self):
+        if self.ring is not None:
+            return self.ring
+        now = monotonic()
+        if now < self.next_attach_time:
+            return None
+        self.next_attach_time = now + REATTACH_INTERVAL_S
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except (FileNotFoundError, OSError):
+            return None
+        # Only the producer may remove the ring, so stop this process's resource
+        # tracker from unlinking it at exit
+        resource_tracker.unregister(shm._name, "shared_memory")
+        header = np.ndarray((), dtype=RING_HEADER_DTYPE, buffer=shm.buf) if (shm.size >= RING_HEADER_SIZE) else None
+        valid = (header is not None) and (RING_MAGIC == header["magic"]) and (RING_VERSION == header["version"])
+        del header
+        if not valid:
+            shm.close()
+            return None
+        self.ring = ShmImageRing(shm)
+        return self.ring
+
+    ## Given a ROS img message referring to a ring slot, get a QImage that owns
+    #  its own data, scaled down to fit the given size if it is any larger. The
+    #  slot is wrapped without copying, so scaling makes the only copy.
+    #  @param self The object pointer.
+    #  @param img_ros The ROS image message referring to a ring slot.
+    #  @param target_size The QSize to fit within, or null to keep the native size.
+    #  @param aspect_mode How to treat the aspect ratio when scaling.
+    #  @return The QImage, or null if the ring is unavailable or the frame has
+    #  since been overwritten, in which case the message's own data should be used.
+    def get_scaled_qimage(self, img_ros, target_size, aspect_mode=Qt.KeepAspectRatio):
+        reference = parse_slot_reference(img_ros.header.frame_id)
+        with self.lock:
+            ring = self.attach() if (reference is not None) and (self.name == reference[0]) else None
+            if (ring is None) or (reference[1] >= ring.slot_count):
+                self.unavailable_count += 1
+                return None
+            _, slot, seq = reference
+            slot_header = ring.slot_headers[slot]
+            if (seq != slot_header["seq_end"]) or (seq != slot_header["seq_begin"]):
+                self.stale_count += 1
+                return None
+            width = int(slot_header["width"])
+            height = int(slot_header["height"])
+            step = int(slot_header["step"])
+            data = ring.slot_data(slot, height * step)
+            qimg = GuiUtils.get_qimage_from_buffer(
+                data, width, height, step, slot_header["encoding"].item().decode()
+            )
+            if qimg is None:
+                self.unavailable_count += 1
+                return None
+            qimg = GuiUtils.get_scaled_qimage(qimg, target_size, aspect_mode)
+            del data
+            if seq != slot_header["seq_begin"]:
+                self.stale_count += 1
+                return None
+            self.hit_count += 1
+            return qimg
+
+    ## Detach from the ring, if attached.
+    #  @param self The object pointer.
+    def close(self):
+        with self.lock:
+            if self.ring is not None:
+                self.ring.close()
+                self.ring = None
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        with self.lock:
+            return "hits={0}, stale={1}, unavailable={2}".format(
+                self.hit_count,
+                self.stale_count,
+                self.unavailable_count
+            )
@@ -1,10 +1,13 @@
-from youtubesearchpython import VideosSearch
+from time import monotonic
+from math import ceil
+from collections import deque
 
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import QTimer, pyqtSignal
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QIcon
 
 from scripts import GuiUtils
+from scripts.YouTubeSearch import YouTubeSearcher, normalize_query
 from scripts.YouTubeVideoListing import YouTubeVideoListing
 from scripts.YouTubeVideoResult import YouTubeVideoResult
 from scripts.QueuedYouTubeVideo import QueuedYouTubeVideo
@@ -24,6 +27,11 @@ class SoundFilePlaybackPage(QWidget):
     audio_download_queue_requested = pyqtSignal(dict)
     ## Emits a soundfile playback command of any type.
     sf_playback_command_requested = pyqtSignal(int)
+    ## Emits the query and error message of a YouTube search that failed
+    youtube_search_failed = pyqtSignal(str, str)
+    ## Emits the query, result count, and times in ms to the first result and to
+    #  all visible thumbnails of a YouTube search whose first page has been shown
+    youtube_search_timed = pyqtSignal(str, int, float, float)
 
     ## The constructor.
     #  @param self The object pointer.
@@ -36,6 +44,24 @@ class SoundFilePlaybackPage(QWidget):
         #
 
         self.queued_youtube_videos = {}
+        self.youtube_searcher = YouTubeSearcher(parent=self)
+        self.youtube_search_query = ""
+        self.youtube_search_start_time = 0.0
+        self.youtube_search_first_result_ms = None
+        self.youtube_search_result_count = 0
+        self.youtube_search_pending_thumbnails = 0
+        self.youtube_search_done = False
+        # Whether the results shown are to be replaced once the current search
+        # has its first result, rather than as soon as it starts
+        self.youtube_search_purge_pending = False
+        # Search as the user types, once they pause, if enabled
+        self.youtube_search_as_you_type = False
+        self.youtube_search_debounce_timer = QTimer(self)
+        self.youtube_search_debounce_timer.setSingleShot(True)
+        # Results received but not yet built into rows, with their search IDs,
+        # since rows are only built as they are about to be scrolled into view
+        self.unshown_search_results = deque()
+        self.search_result_row_count = 0
 
         #
         # Basic UI/cosmetics
@@ -73,6 +99,13 @@ class SoundFilePlaybackPage(QWidget):
         self.ui.skip_btn.clicked.connect(lambda: self.request_playback_command(RequestPlaybackCommand.Request.SKIP))
         self.ui.clear_youtube_search_btn.clicked.connect(self.clear_youtube_search)
         self.ui.youtube_search_btn.clicked.connect(self.search_youtube)
+        self.ui.youtube_search_bar.textEdited.connect(self.handle_youtube_search_edited)
+        self.youtube_search_debounce_timer.timeout.connect(self.search_youtube)
+        self.youtube_searcher.result_found.connect(self.add_search_result)
+        self.youtube_searcher.page_finished.connect(self.finish_youtube_search_page)
+        search_results_scroll_bar = self.ui.search_results_scroll_area.verticalScrollBar()
+        search_results_scroll_bar.valueChanged.connect(lambda *args: self.fill_search_results())
+        search_results_scroll_bar.rangeChanged.connect(lambda *args: self.fill_search_results())
 
         # Done
         self.show()
@@ -82,6 +115,8 @@ class SoundFilePlaybackPage(QWidget):
     def purge_search_results(self):
         for i in reversed(range(self.ui.search_results_layout.count())):
             self.ui.search_results_layout.itemAt(i).widget().deleteLater()
+        self.unshown_search_results.clear()
+        self.search_result_row_count = 0
 
     ## Emit a signal that passes along the requested command.
     #  @param self The object pointer.
@@ -96,27 +131,167 @@ class SoundFilePlaybackPage(QWidget):
         self.ui.playback_time.setText("--:-- / --:--")
         self.ui.sound_file_playback_status.setValue(0)
 
+    ## Set where YouTube searches are sent.
+    #  @param self The object pointer.
+    #  @param backend The search backend, e.g. a YouTubeSearchBackend or LocalSearchBackend.
+    def set_search_backend(self, backend):
+        self.youtube_searcher.backend = backend
+
+    ## Turn searching as the user types on or off.
+    #  @param self The object pointer.
+    #  @param enabled Whether to search as the user types.
+    #  @param debounce_ms How long typing must pause for before searching.
+    def set_search_as_you_type(self, enabled, debounce_ms):
+        self.youtube_search_as_you_type = enabled
+        self.youtube_search_debounce_timer.setInterval(debounce_ms)
+        if not enabled:
+            self.youtube_search_debounce_timer.stop()
+
     ## Clear the YouTube search text and the video results.
     #  @param self The object pointer.
     def clear_youtube_search(self):
+        self.youtube_search_debounce_timer.stop()
+        self.youtube_searcher.cancel()
+        self.youtube_search_query = ""
+        self.youtube_search_purge_pending = False
         self.ui.youtube_search_bar.setText("")
         self.purge_search_results()
 
-    ## Clear the YouTube search text and the video results.
+    ## When searching as the user types, show the cached results of the longest
+    #  query the text starts with, if any, right away, then search for the text
+    #  itself once typing pauses.
+    #  @param self The object pointer.
+    #  @param text The search bar's new text.
+    def handle_youtube_search_edited(self, text):
+        if not self.youtube_search_as_you_type: return
+        query = normalize_query(text)
+        if query == normalize_query(self.youtube_search_query):
+            self.youtube_search_debounce_timer.stop()
+            return
+        if not query:
+            self.clear_youtube_search()
+            return
+        cached_prefix_results = getattr(self.youtube_searcher.backend, "cached_prefix_results", None)
+        results = cached_prefix_results(query) if (cached_prefix_results is not None) else None
+        if results:
+            # Stop the replaced search from paging more results in under these
+            self.youtube_searcher.cancel()
+            self.purge_search_results()
+            self.unshown_search_results.extend((result_dict, None) for result_dict in results)
+            self.fill_search_results()
+        self.youtube_search_debounce_timer.start()
+
+    ## Search YouTube for the search bar's text in the background, replacing the
+    #  video results with those of the new search as they arrive. When searching
+    #  as the user types, the results shown stay until the first new one arrives.
+    #  Further pages are fetched as the results are scrolled to the bottom.
     #  @param self The object pointer.
     def search_youtube(self):
+        self.youtube_search_debounce_timer.stop()
         query = self.ui.youtube_search_bar.text()
-        if query:
+        if normalize_query(query):
+            if self.youtube_search_as_you_type:
+                self.youtube_search_purge_pending = True
+            else:
+                self.purge_search_results()
+            self.youtube_search_query = query
+            self.youtube_search_start_time = monotonic()
+            self.youtube_search_first_result_ms = None
+            self.youtube_search_result_count = 0
+            self.youtube_search_pending_thumbnails = 0
+            self.youtube_search_done = False
+            self.youtube_searcher.search(query)
+
+    ## Add a video result of the current YouTube search.
+    #  @param self The object pointer.
+    #  @param search_id The ID of the search the result belongs to.
+    #  @param result_dict The YouTube query result that describes the video.
+    def add_search_result(self, search_id, result_dict):
+        if not self.youtube_searcher.is_current(search_id): return
+        if self.youtube_search_purge_pending:
+            self.youtube_search_purge_pending = False
             self.purge_search_results()
-            search_results = VideosSearch(
-                query,
-                limit=GuiUtils.YOUTUBE_SEARCH_RESULT_COUNT
-            ).result()["result"]
-            for n in range(len(search_results)):
-                vid_result = YouTubeVideoResult(self.ui.search_results_scroll_area)
-                vid_result.ui.youtube_video_listing.populate(search_results[n])
-                vid_result.queue_requested.connect(self.audio_download_queue_requested)
-                self.ui.search_results_layout.addWidget(vid_result)
+        if self.youtube_search_first_result_ms is None:
+            self.youtube_search_first_result_ms = 1000 * (monotonic() - self.youtube_search_start_time)
+        self.youtube_search_result_count += 1
+        self.unshown_search_results.append((result_dict, search_id))
+        self.fill_search_results()
+
+    ## Build rows for unshown results until the view, plus a few rows below it,
+    #  is filled, and fetch the next page of the current search if they run out.
+    #  Rows, and so their thumbnails, are only built once about to be seen.
+    #  @param self The object pointer.
+    def fill_search_results(self):
+        scroll_area = self.ui.search_results_scroll_area
+        layout = self.ui.search_results_layout
+        row_height = GuiUtils.YOUTUBE_THUMBNAIL_HEIGHT
+        if self.search_result_row_count:
+            row_height = layout.itemAt(layout.count() - 1).widget().sizeHint().height()
+        row_height = max(row_height + layout.spacing(), 1)
+        bottom = scroll_area.verticalScrollBar().value() + scroll_area.viewport().height()
+        wanted_row_count = ceil(bottom / row_height) + GuiUtils.YOUTUBE_SEARCH_LOOKAHEAD_ROWS
+        while (self.search_result_row_count < wanted_row_count) and self.unshown_search_results:
+            self.show_search_result(*self.unshown_search_results.popleft())
+        if self.search_result_row_count < wanted_row_count:
+            self.youtube_searcher.fetch_next_page()
+
+    ## Add a widget for a video result to the search results.
+    #  @param self The object pointer.
+    #  @param result_dict The YouTube query result that describes the video.
+    #  @param search_id The ID of the search the result belongs to, whose loaded
+    #  thumbnails are counted, or null if the result is only shown provisionally.
+    def show_search_result(self, result_dict, search_id=None):
+        vid_result = YouTubeVideoResult(self.ui.search_results_scroll_area)
+        self.search_result_row_count += 1
+        if (search_id is not None) and self.youtube_searcher.is_current(search_id):
+            self.youtube_search_pending_thumbnails += 1
+            vid_result.ui.youtube_video_listing.thumbnail_loaded.connect(
+                lambda: self.handle_search_result_thumbnail_loaded(search_id)
+            )
+        vid_result.ui.youtube_video_listing.populate(result_dict)
+        vid_result.queue_requested.connect(self.audio_download_queue_requested)
+        self.ui.search_results_layout.addWidget(vid_result)
+
+    ## Count down the thumbnails of the current YouTube search still loading.
+    #  @param self The object pointer.
+    #  @param search_id The ID of the search the thumbnail's result belongs to.
+    def handle_search_result_thumbnail_loaded(self, search_id):
+        if not self.youtube_searcher.is_current(search_id): return
+        self.youtube_search_pending_thumbnails -= 1
+        self.report_youtube_search_timing()
+
+    ## Report a page of the current YouTube search if it failed, and keep filling
+    #  the view from further pages if it is not yet full.
+    #  @param self The object pointer.
+    #  @param search_id The ID of the search the page belongs to.
+    #  @param error The error message, empty if the page was fetched.
+    #  @param has_more Whether there may be more pages.
+    def finish_youtube_search_page(self, search_id, error, has_more):
+        if not self.youtube_searcher.is_current(search_id): return
+        if not self.youtube_search_done:
+            self.youtube_search_done = True
+            if self.youtube_search_purge_pending:
+                self.youtube_search_purge_pending = False
+                self.purge_search_results()
+        if error:
+            self.youtube_search_failed.emit(self.youtube_search_query, error)
+        self.report_youtube_search_timing()
+        if has_more:
+            self.fill_search_results()
+
+    ## Report how long the current YouTube search took to show, once its first
+    #  page has finished and all the thumbnails of its rows have loaded.
+    #  @param self The object pointer.
+    def report_youtube_search_timing(self):
+        if (not self.youtube_search_done) or self.youtube_search_pending_thumbnails \
+            or (self.youtube_search_first_result_ms is None): return
+        self.youtube_search_timed.emit(
+            self.youtube_search_query,
+            self.youtube_search_result_count,
+            self.youtube_search_first_result_ms,
+            1000 * (monotonic() - self.youtube_search_start_time)
+        )
+        self.youtube_search_first_result_ms = None
 
     ## Queue a video that is confirmed able to start downloading.
     #  @param self The object pointer.
@@ -0,0 +1,191 @@
+from os import listdir, makedirs, remove, replace, stat, utime
+from os.path import expanduser, join as ojoin
+from hashlib import sha1
+from threading import Lock
+from collections import OrderedDict
+
+#
+# Constants
+#
+
+# Where thumbnails are cached on disk unless configured otherwise
+DEFAULT_THUMBNAIL_CACHE_DIRECTORY = expanduser(ojoin("~", ".cache", "sh_gui", "thumbnails"))
+
+# The file extension of cached thumbnails, which are stored pre-scaled
+THUMBNAIL_CACHE_FILE_EXTENSION = ".jpg"
+
+#
+# Class definitions
+#
+
+## A least-recently-used cache of QImages keyed by string, bounded by the total
+#  size of the images' pixel data. It must only be used from one thread.
+class MemoryImageCache(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param byte_budget The max total size of the cached images, zero to disable the cache.
+    def __init__(self, byte_budget):
+        self.byte_budget = byte_budget
+        self.images = OrderedDict()
+        self.byte_count = 0
+        self.hits = 0
+        self.misses = 0
+
+    ## Get the image for the given key.
+    #  @param self The object pointer.
+    #  @param key The key.
+    #  @return The QImage, or null if it is not cached.
+    def get(self, key):
+        qimg = self.images.get(key)
+        if qimg is None:
+            self.misses += 1
+            return None
+        self.images.move_to_end(key)
+        self.hits += 1
+        return qimg
+
+    ## Cache an image, evicting the least recently used images over the budget.
+    #  @param self The object pointer.
+    #  @param key The key.
+    #  @param qimg The QImage.
+    def put(self, key, qimg):
+        size = qimg.sizeInBytes()
+        if size > self.byte_budget: return
+        old = self.images.pop(key, None)
+        if old is not None:
+            self.byte_count -= old.sizeInBytes()
+        self.images[key] = qimg
+        self.byte_count += size
+        while self.byte_count > self.byte_budget:
+            _, evicted = self.images.popitem(last=False)
+            self.byte_count -= evicted.sizeInBytes()
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        return "hits={0}, misses={1}, images={2}, bytes={3}/{4}".format(
+            self.hits,
+            self.misses,
+            len(self.images),
+            self.byte_count,
+            self.byte_budget
+        )
+
+## A least-recently-used cache of files in a directory keyed by string, bounded
+#  by the total size of the files. Files are named by the hash of their key, and
+#  their modification times record their use, so the cache carries over between
+#  runs. It is safe to use from any thread.
+class DiskFileCache(object):
+
+    ## The constructor, which indexes any files already in the directory.
+    #  @param self The object pointer.
+    #  @param directory The directory to keep the files in, created if needed.
+    #  @param byte_budget The max total size of the cached files, zero to disable the cache.
+    def __init__(self, directory, byte_budget):
+        self.directory = directory
+        self.byte_budget = byte_budget
+        self.lock = Lock()
+        self.files = OrderedDict()
+        self.byte_count = 0
+        self.hits = 0
+        self.misses = 0
+        if byte_budget <= 0: return
+        makedirs(directory, exist_ok=True)
+        entries = []
+        for filename in listdir(directory):
+            if filename.endswith(THUMBNAIL_CACHE_FILE_EXTENSION):
+                st = stat(ojoin(directory, filename))
+                entries.append((st.st_mtime, filename, st.st_size))
+        for _, filename, size in sorted(entries):
+            self.files[filename] = size
+            self.byte_count += size
+        with self.lock:
+            self.evict()
+
+    ## Get the name of the file for the given key.
+    #  @param self The object pointer.
+    #  @param key The key.
+    #  @return The file name.
+    def filename_of(self, key):
+        return sha1(key.encode()).hexdigest() + THUMBNAIL_CACHE_FILE_EXTENSION
+
+    ## Get the contents of the file for the given key.
+    #  @param self The object pointer.
+    #  @param key The key.
+    #  @return The file's bytes, or null if it is not cached.
+    def get(self, key):
+        filename = self.filename_of(key)
+        path = ojoin(self.directory, filename)
+        with self.lock:
+            if filename not in self.files:
+                self.misses += 1
+                return None
+            self.files.move_to_end(filename)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            utime(path)
+        except OSError:
+            with self.lock:
+                self.forget(filename)
+                self.misses += 1
+            return None
+        with self.lock:
+            self.hits += 1
+        return data
+
+    ## Cache a file's contents, evicting the least recently used files over the budget.
+    #  @param self The object pointer.
+    #  @param key The key.
+    #  @param data The file's bytes.
+    def put(self, key, data):
+        if len(data) > self.byte_budget: return
+        filename = self.filename_of(key)
+        path = ojoin(self.directory, filename)
+        try:
+            # Write to the side then move into place, so readers never see a partial file
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            replace(path + ".tmp", path)
+        except OSError:
+            return
+        with self.lock:
+            self.forget(filename)
+            self.files[filename] = len(data)
+            self.byte_count += len(data)
+            self.evict()
+
+    ## Drop a file from the index. Must be called with the lock held.
+    #  @param self The object pointer.
+    #  @param filename The file name.
+    def forget(self, filename):
+        size = self.files.pop(filename, None)
+        if size is not None:
+            self.byte_count -= size
+
+    ## Remove the least recently used files until within budget. Must be called
+    #  with the lock held.
+    #  @param self The object pointer.
+    def evict(self):
+        while self.byte_count > self.byte_budget:
+            filename, size = self.files.popitem(last=False)
+            self.byte_count -= size
+            try:
+                remove(ojoin(self.directory, filename))
+            except OSError:
+                pass
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        with self.lock:
+            return "hits={0}, misses={1}, files={2}, bytes={3}/{4}".format(
+                self.hits,
+                self.misses,
+                len(self.files),
+                self.byte_count,
+                self.byte_budget
+            )
@@ -0,0 +1,304 @@
+from threading import local as thread_local
+from urllib.parse import urljoin, urlsplit
+from urllib.request import urlopen
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from scripts import GuiUtils
+from scripts.ThumbnailCache import MemoryImageCache, DiskFileCache, DEFAULT_THUMBNAIL_CACHE_DIRECTORY
+
+#
+# Constants
+#
+
+# The max number of thumbnails fetched at once
+THUMBNAIL_FETCH_THREAD_COUNT = 4
+
+# How long to wait on a thumbnail server, in seconds
+THUMBNAIL_FETCH_TIMEOUT_S = 10
+
+# The max number of redirects followed to fetch a thumbnail
+THUMBNAIL_FETCH_MAX_REDIRECTS = 5
+
+# The HTTP statuses that redirect to the URL in the Location header
+HTTP_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# The default max total sizes of the in-memory and on-disk thumbnail caches
+THUMBNAIL_MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+THUMBNAIL_DISK_CACHE_BYTES = 64 * 1024 * 1024
+
+# The quality of the JPEGs that thumbnails are cached on disk as
+THUMBNAIL_DISK_CACHE_JPEG_QUALITY = 90
+
+#
+# Global functions
+#
+
+## Encode a QImage as a JPEG.
+#  @param qimg The QImage.
+#  @param quality The JPEG quality, from 0 to 100.
+#  @return The JPEG bytes, empty if encoding failed.
+def encode_jpeg(qimg, quality):
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    if not qimg.save(buf, "JPEG", quality):
+        return b""
+    return bytes(data)
+
+#
+# Class definitions
+#
+
+## A minimal HTTP(S) GET client that keeps one keep-alive connection per host
+#  for each thread it is used from, so a thread fetching many files from the
+#  same server connects (and handshakes) only once. Redirects are followed, up
+#  to a limit. Other URL schemes, such as local files, are read through urlopen.
+class PooledHttpClient(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param timeout How long to wait on a server, in seconds.
+    def __init__(self, timeout=THUMBNAIL_FETCH_TIMEOUT_S):
+        self.timeout = timeout
+        self.local = thread_local()
+
+    ## Get this thread's connection to a host, opening it if needed.
+    #  @param self The object pointer.
+    #  @param scheme Either "http" or "https".
+    #  @param netloc The host, and port if any.
+    #  @return The HTTPConnection.
+    def get_connection(self, scheme, netloc):
+        connections = getattr(self.local, "connections", None)
+        if connections is None:
+            connections = self.local.connections = {}
+        key = (scheme, netloc)
+        conn = connections.get(key)
+        if conn is None:
+            conn_type = HTTPSConnection if ("https" == scheme) else HTTPConnection
+            conn = connections[key] = conn_type(netloc, timeout=self.timeout)
+        return conn
+
+    ## Drop this thread's connection to a host.
+    #  @param self The object pointer.
+    #  @param scheme Either "http" or "https".
+    #  @param netloc The host, and port if any.
+    def drop_connection(self, scheme, netloc):
+        conn = self.local.connections.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    ## Get the contents of a URL, following any redirects.
+    #  @param self The object pointer.
+    #  @param url The URL.
+    #  @return The response body bytes.
+    def get(self, url):
+        for _ in range(THUMBNAIL_FETCH_MAX_REDIRECTS + 1):
+            body, location = self.get_once(url)
+            if location is None:
+                return body
+            url = urljoin(url, location)
+        raise HTTPException("GET {0} redirected more than {1} times".format(url, THUMBNAIL_FETCH_MAX_REDIRECTS))
+
+    ## Get the contents of a URL, without following redirects. A request on a
+    #  reused connection that the server has since closed is retried once on a
+    #  new connection.
+    #  @param self The object pointer.
+    #  @param url The URL.
+    #  @return A tuple of the response body bytes and the URL redirected to, if any.
+    def get_once(self, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            with urlopen(url, timeout=self.timeout) as response:
+                return response.read(), None
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        for attempt in range(2):
+            conn = self.get_connection(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                body = response.read()
+            except (HTTPException, ConnectionError):
+                self.drop_connection(parts.scheme, parts.netloc)
+                if attempt: raise
+                continue
+            except OSError:
+                self.drop_connection(parts.scheme, parts.netloc)
+                raise
+            if response.will_close:
+                self.drop_connection(parts.scheme, parts.netloc)
+            location = response.getheader("Location")
+            if (response.status in HTTP_REDIRECT_STATUSES) and location:
+                return body, location
+            if 200 != response.status:
+                raise HTTPException("GET {0} returned {1} {2}".format(url, response.status, response.reason))
+            return body, None
+
+## A task to load one thumbnail on a pool thread, from the disk cache if it is
+#  there, otherwise by fetching, decoding, and scaling it, then caching it.
+class ThumbnailFetchTask(QRunnable):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param loader The ThumbnailLoader to report the result to.
+    #  @param disk_cache The DiskFileCache to check and fill, or null if there is none.
+    #  @param key The cache key of the thumbnail.
+    #  @param url The URL of the thumbnail.
+    def __init__(self, loader, disk_cache, key, url):
+        super(ThumbnailFetchTask, self).__init__()
+        self.loader = loader
+        self.disk_cache = disk_cache
+        self.key = key
+        self.url = url
+
+    ## Load the thumbnail and hand it back to the loader's thread, as a null
+    #  image if it could not be loaded for any reason, so the loader always hears
+    #  back and can try it again later.
+    #  @param self The object pointer.
+    def run(self):
+        try:
+            qimg = self.load()
+        except Exception:
+            qimg = QImage()
+        self.loader.fetched.emit(self.key, qimg)
+
+    ## Load the thumbnail.
+    #  @param self The object pointer.
+    #  @return The scaled QImage, null if it could not be fetched or decoded.
+    def load(self):
+        disk_cache = self.disk_cache
+        data = disk_cache.get(self.key) if (disk_cache is not None) else None
+        if data is not None:
+            qimg = QImage.fromData(data)
+            if not qimg.isNull():
+                return qimg
+        try:
+            qimg = QImage.fromData(self.loader.http_client.get(self.url))
+        except (HTTPException, OSError, ValueError):
+            return QImage()
+        if not qimg.isNull():
+            qimg = qimg.scaledToHeight(GuiUtils.YOUTUBE_THUMBNAIL_HEIGHT, Qt.SmoothTransformation)
+            if (disk_cache is not None) and (disk_cache.byte_budget > 0):
+                data = encode_jpeg(qimg, THUMBNAIL_DISK_CACHE_JPEG_QUALITY)
+                if data:
+                    disk_cache.put(self.key, data)
+        return qimg
+
+## Loads video thumbnails in the background through a bounded pool of threads
+#  sharing a PooledHttpClient. Scaled thumbnails are kept in two cache tiers: an
+#  in-memory LRU of QImages, checked on the spot, and an on-disk LRU of JPEGs,
+#  checked on the pool, which carries over between runs. The caches are only
+#  built once the first thumbnail is loaded, so nothing touches the disk before
+#  they are configured, and if the on-disk cache cannot be set up, only the
+#  in-memory one is used. Requests for a thumbnail already being loaded wait on
+#  that load rather than starting another.
+class ThumbnailLoader(QObject):
+
+    #
+    # Qt Signal(s)
+    #
+
+    ## Emits a loaded thumbnail, from a pool thread, with its cache key
+    fetched = pyqtSignal(str, QImage)
+    ## Emits a display-ready thumbnail, on this object's thread, with its cache
+    #  key; the image is null if it could not be loaded
+    thumbnail_ready = pyqtSignal(str, QImage)
+    ## Emits the directory and error message of an on-disk cache that could not
+    #  be set up, after which only the in-memory cache is used
+    disk_cache_failed = pyqtSignal(str, str)
+
+    # The instance shared by all video listings
+    shared_instance = None
+
+    ## Get the instance shared by all video listings, creating it if needed. Must
+    #  be called from the Qt main thread.
+    #  @return The ThumbnailLoader.
+    @classmethod
+    def instance(cls):
+        if cls.shared_instance is None:
+            cls.shared_instance = cls()
+        return cls.shared_instance
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param parent This object's optional Qt parent.
+    def __init__(self, parent=None):
+        super(ThumbnailLoader, self).__init__(parent)
+        # Local variable(s)
+        self.http_client = PooledHttpClient()
+        self.cache_config = (THUMBNAIL_MEMORY_CACHE_BYTES, THUMBNAIL_DISK_CACHE_BYTES, DEFAULT_THUMBNAIL_CACHE_DIRECTORY)
+        self.memory_cache = None
+        self.disk_cache = None
+        self.in_flight = set()
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(THUMBNAIL_FETCH_THREAD_COUNT)
+        # Keep idle threads, and so their open connections, around
+        self.thread_pool.setExpiryTimeout(-1)
+        # Make Qt connections
+        self.fetched.connect(self.handle_fetched)
+
+    ## Configure the thumbnail caches, e.g. to apply configured budgets, which
+    #  replaces any already built. Must be called while no thumbnail is loading.
+    #  @param self The object pointer.
+    #  @param memory_bytes The max total size of the in-memory cache, zero to disable it.
+    #  @param disk_bytes The max total size of the on-disk cache, zero to disable it.
+    #  @param directory The directory of the on-disk cache.
+    def configure_caches(self, memory_bytes, disk_bytes, directory=DEFAULT_THUMBNAIL_CACHE_DIRECTORY):
+        self.cache_config = (memory_bytes, disk_bytes, directory)
+        self.memory_cache = None
+        self.disk_cache = None
+
+    ## Build the thumbnail caches as configured, unless already built. If the
+    #  on-disk cache's directory cannot be created or read, there is none.
+    #  @param self The object pointer.
+    def build_caches(self):
+        if self.memory_cache is not None: return
+        memory_bytes, disk_bytes, directory = self.cache_config
+        self.memory_cache = MemoryImageCache(memory_bytes)
+        try:
+            self.disk_cache = DiskFileCache(directory, disk_bytes)
+        except OSError as e:
+            self.disk_cache = None
+            self.disk_cache_failed.emit(directory, str(e))
+
+    ## Start loading a thumbnail, unless it is already being loaded. The result
+    #  is emitted through thumbnail_ready, right away if it is cached in memory.
+    #  Must be called from this object's thread.
+    #  @param self The object pointer.
+    #  @param url The URL of the thumbnail.
+    #  @param key The cache key of the thumbnail, e.g. its video's ID, or null to use the URL.
+    def load(self, url, key=None):
+        key = key or url
+        self.build_caches()
+        qimg = self.memory_cache.get(key)
+        if qimg is not None:
+            self.thumbnail_ready.emit(key, qimg)
+            return
+        if key in self.in_flight: return
+        self.in_flight.add(key)
+        self.thread_pool.start(ThumbnailFetchTask(self, self.disk_cache, key, url))
+
+    ## Cache and hand off a loaded thumbnail.
+    #  @param self The object pointer.
+    #  @param key The cache key of the thumbnail.
+    #  @param qimg The thumbnail, null if it could not be loaded.
+    def handle_fetched(self, key, qimg):
+        self.in_flight.discard(key)
+        if not qimg.isNull():
+            self.memory_cache.put(key, qimg)
+        self.thumbnail_ready.emit(key, qimg)
+
+    ## Get a human-readable summary of the cache counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        if self.memory_cache is None:
+            return "unused"
+        return "memory: {0}; disk: {1}".format(
+            self.memory_cache.summary(),
+            self.disk_cache.summary() if (self.disk_cache is not None) else "unavailable"
+        )
@@ -0,0 +1,145 @@
+from math import pi
+
+import numpy as np
+
+#
+# Constants
+#
+
+_2PI = 2 * pi
+
+# The number of spatial dimensions participant coordinates are padded to
+SPATIAL_DIMENSIONS = 3
+
+# The names of the builtin field types
+ANGULAR = "angular"
+RADIAL = "radial"
+PLANAR = "planar"
+SUPERPOSED = "superposed"
+
+#
+# Global functions
+#
+
+## Pad 1D/2D/3D coordinates with zeros to SPATIAL_DIMENSIONS.
+#  @param coords A sequence of coordinates, or a sequence of sequences of coordinates.
+#  @return The padded array, with a trailing axis of length SPATIAL_DIMENSIONS.
+def to_spatial(coords):
+    arr = np.atleast_1d(np.asarray(coords, dtype=np.float64))
+    assert arr.shape[-1] <= SPATIAL_DIMENSIONS, \
+        "Coordinates have more than {0} dimensions: {1}".format(SPATIAL_DIMENSIONS, arr.shape)
+    pad = [(0, 0)] * (arr.ndim - 1) + [(0, SPATIAL_DIMENSIONS - arr.shape[-1])]
+    return np.pad(arr, pad)
+
+#
+# Class definitions
+#
+
+## The classic wave mode field, where each participant's scalar position is its
+#  angle around a single revolution.
+class AngularField(object):
+
+    ## Calculate each participant's phase offset from the wave.
+    #  @param self The object pointer.
+    #  @param coordinates The (N,3) array of participant coordinates.
+    #  @param positions The (N,) array of participant scalar positions.
+    #  @return The (N,1) array of phase offsets, in radians.
+    def phase_offsets(self, coordinates, positions):
+        return np.asarray(positions, dtype=np.float64).reshape(-1, 1)
+
+    ## Get a serializable description of this field.
+    #  @param self The object pointer.
+    #  @return The dictionary describing the field.
+    def to_dict(self):
+        return {"type": ANGULAR}
+
+## Circular/spherical waves radiating outwards from one or more source points.
+class RadialField(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param sources A sequence of source points, each with 1 to 3 coordinates.
+    #  @param wavelength The distance between successive wave crests.
+    def __init__(self, sources, wavelength):
+        self.sources = to_spatial(sources).reshape(-1, SPATIAL_DIMENSIONS)
+        self.wavelength = float(wavelength)
+
+    ## Calculate each participant's phase offset from each source.
+    #  @param self The object pointer.
+    #  @param coordinates The (N,3) array of participant coordinates.
+    #  @param positions The (N,) array of participant scalar positions.
+    #  @return The (N,S) array of phase offsets, in radians.
+    def phase_offsets(self, coordinates, positions):
+        distances = np.linalg.norm(coordinates[:, np.newaxis, :] - self.sources[np.newaxis, :, :], axis=2)
+        return distances * (_2PI / self.wavelength)
+
+    ## Get a serializable description of this field.
+    #  @param self The object pointer.
+    #  @return The dictionary describing the field.
+    def to_dict(self):
+        return {"type": RADIAL, "sources": self.sources.tolist(), "wavelength": self.wavelength}
+
+## Plane waves travelling along one or more directions.
+class PlanarField(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param directions A sequence of travel directions, each with 1 to 3 components.
+    #  @param wavelength The distance between successive wave crests.
+    def __init__(self, directions, wavelength):
+        directions = to_spatial(directions).reshape(-1, SPATIAL_DIMENSIONS)
+        self.directions = directions / np.linalg.norm(directions, axis=1, keepdims=True)
+        self.wavelength = float(wavelength)
+
+    ## Calculate each participant's phase offset along each direction.
+    #  @param self The object pointer.
+    #  @param coordinates The (N,3) array of participant coordinates.
+    #  @param positions The (N,) array of participant scalar positions.
+    #  @return The (N,S) array of phase offsets, in radians.
+    def phase_offsets(self, coordinates, positions):
+        return np.dot(coordinates, self.directions.T) * (_2PI / self.wavelength)
+
+    ## Get a serializable description of this field.
+    #  @param self The object pointer.
+    #  @return The dictionary describing the field.
+    def to_dict(self):
+        return {"type": PLANAR, "directions": self.directions.tolist(), "wavelength": self.wavelength}
+
+## The superposition of several fields, each contributing one or more sources.
+class SuperposedField(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param fields The sequence of fields to superpose.
+    def __init__(self, fields):
+        self.fields = list(fields)
+
+    ## Calculate each participant's phase offset from every source of every field.
+    #  @param self The object pointer.
+    #  @param coordinates The (N,3) array of participant coordinates.
+    #  @param positions The (N,) array of participant scalar positions.
+    #  @return The (N,S) array of phase offsets, in radians.
+    def phase_offsets(self, coordinates, positions):
+        return np.hstack([f.phase_offsets(coordinates, positions) for f in self.fields])
+
+    ## Get a serializable description of this field.
+    #  @param self The object pointer.
+    #  @return The dictionary describing the field.
+    def to_dict(self):
+        return {"type": SUPERPOSED, "fields": [f.to_dict() for f in self.fields]}
+
+## Rebuild a field from its serializable description.
+#  @param desc The dictionary describing the field.
+#  @return The field.
+def field_from_dict(desc):
+    field_type = desc["type"]
+    if ANGULAR == field_type:
+        return AngularField()
+    elif RADIAL == field_type:
+        return RadialField(desc["sources"], desc["wavelength"])
+    elif PLANAR == field_type:
+        return PlanarField(desc["directions"], desc["wavelength"])
+    elif SUPERPOSED == field_type:
+        return SuperposedField(field_from_dict(d) for d in desc["fields"])
+    else:
+        assert False, "Unknown wave field type: '{0}'".format(field_type)
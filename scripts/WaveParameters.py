@@ -0,0 +1,104 @@
+from json import dumps, loads
+
+import numpy as np
+
+from scripts import Waveforms, WaveFields
+
+#
+# Global functions
+#
+
+## Serialize the parameters that fully describe a wave, so that participants can
+#  synthesize their own intensities.
+#  @param period The revolution period, in milliseconds.
+#  @param epoch The wall-clock timestamp, in seconds, where the wave was at location zero.
+#  @param waveform The WaveformTable of the wave's shape.
+#  @param field The field describing how the wave propagates through space.
+#  @param participants An iterable of (participant ID, position, coordinates) tuples.
+#  @return The serialized parameters.
+def encode_wave_parameters(period, epoch, waveform, field, participants):
+    params = {
+        "period_ms": period,
+        "epoch": epoch,
+        "waveform": waveform.name,
+        "width": waveform.width,
+        "resolution": waveform.resolution,
+        "field": field.to_dict(),
+        "participants": [[int(pid), float(pos), list(coords)] for pid, pos, coords in participants],
+    }
+    if Waveforms.CUSTOM == waveform.name:
+        params["table"] = waveform.table.tolist()
+    return dumps(params)
+
+## Deserialize wave parameters.
+#  @param data The serialized parameters.
+#  @return The dictionary of parameters.
+def decode_wave_parameters(data):
+    return loads(data)
+
+## Rebuild the waveform table described by wave parameters.
+#  @param params The dictionary of parameters.
+#  @return The WaveformTable.
+def waveform_from_parameters(params):
+    if Waveforms.CUSTOM == params["waveform"]:
+        return Waveforms.WaveformTable(Waveforms.CUSTOM, np.asarray(params["table"]))
+    return Waveforms.build_waveform_table(
+        params["waveform"],
+        resolution=params["resolution"],
+        width=params["width"]
+    )
+
+#
+# Class definitions
+#
+
+## A reference implementation of a wave participant that synthesizes its own
+#  intensity from broadcast wave parameters and a synchronized wall clock, as a
+#  device would when the GUI is in parametric wave mode.
+class LocalWaveParticipant(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param participant_id The integer ID of this participant.
+    def __init__(self, participant_id):
+        self.participant_id = participant_id
+        self.period = None
+        self.epoch = None
+        self.waveform = None
+        self.offsets = None
+
+    ## Accept the latest broadcast wave parameters. If this participant is not
+    #  listed in them, it stays idle.
+    #  @param self The object pointer.
+    #  @param data The serialized parameters.
+    def update_parameters(self, data):
+        params = decode_wave_parameters(data)
+        locations = dict((pid, (pos, coords)) for pid, pos, coords in params["participants"])
+        if self.participant_id not in locations:
+            self.offsets = None
+            return
+        self.period = params["period_ms"]
+        self.epoch = params["epoch"]
+        if (
+            (self.waveform is None)
+            or (self.waveform.name != params["waveform"])
+            or (self.waveform.width != params["width"])
+            or (self.waveform.resolution != params["resolution"])
+            or (Waveforms.CUSTOM == params["waveform"])
+        ):
+            self.waveform = waveform_from_parameters(params)
+        position, coords = locations[self.participant_id]
+        self.offsets = self.waveform.indices_of(WaveFields.field_from_dict(params["field"]).phase_offsets(
+            np.asarray([coords], dtype=np.float64),
+            np.asarray([position], dtype=np.float64)
+        )[0])
+
+    ## Calculate this participant's intensity at the given time.
+    #  @param self The object pointer.
+    #  @param now The wall-clock timestamp, in seconds.
+    #  @return The intensity, or null if not participating.
+    def intensity_at(self, now):
+        if self.offsets is None: return None
+        fraction = ((now - self.epoch) * 1000 / self.period) % 1.0
+        indices = int(round(fraction * self.waveform.resolution)) - self.offsets
+        return float(np.mean(self.waveform.table[indices & self.waveform.mask]))
@@ -0,0 +1,145 @@
+from collections import deque
+
+import numpy as np
+
+from scripts import WaveFields
+
+#
+# Constants
+#
+
+# The initial number of participant slots to allocate in the registry's buffers
+WAVE_PARTICIPANT_INITIAL_CAPACITY = 64
+
+#
+# Class definitions
+#
+
+## The result of applying a batch of registrations to the registry.
+class RegistryFlushResult(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param added The list of ID's of newly added participants.
+    #  @param moved Whether or not any known participant's position changed.
+    #  @param evicted The list of ID's of participants evicted for not responding.
+    def __init__(self, added, moved, evicted):
+        self.added = added
+        self.moved = moved
+        self.evicted = evicted
+
+    ## Whether or not the set of participants or their positions changed.
+    #  @param self The object pointer.
+    #  @return True if anything changed.
+    def changed(self):
+        return bool(self.added or self.moved or self.evicted)
+
+## An indexed registry of wave participants kept in contiguous buffers. Responses
+#  can be submitted from any thread and are only applied, in one batch, when the
+#  registry is flushed. Participants that have not responded within a timeout are
+#  evicted on flush, keeping the buffers compact and holding only live devices.
+#  Each participant also has spatial coordinates, which default to its scalar
+#  position along the x-axis unless explicitly set.
+class WaveParticipantRegistry(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param timeout The number of seconds without a response after which a
+    #  participant is evicted, or zero to never evict.
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.pending = deque()
+        self.id_index_map = {}
+        self.participant_ids = np.empty(WAVE_PARTICIPANT_INITIAL_CAPACITY, dtype=np.int64)
+        self.positions = np.empty(WAVE_PARTICIPANT_INITIAL_CAPACITY, dtype=np.float64)
+        self.last_seen = np.empty(WAVE_PARTICIPANT_INITIAL_CAPACITY, dtype=np.float64)
+        self.coordinates = np.empty(
+            (WAVE_PARTICIPANT_INITIAL_CAPACITY, WaveFields.SPATIAL_DIMENSIONS),
+            dtype=np.float64
+        )
+        self.coordinate_overrides = {}
+        self.count = 0
+        self.participant_ids_list = []
+
+    ## Queue a participant's response to be applied on the next flush. This is
+    #  safe to call from any thread.
+    #  @param self The object pointer.
+    #  @param msg The WaveParticipantLocation msg.
+    #  @param now The monotonic timestamp, in seconds, it was received at.
+    def submit(self, msg, now):
+        self.pending.append((msg.participant_id, msg.position, now))
+
+    ## Set the spatial coordinates of a participant, whether or not it has
+    #  responded yet. This is not thread-safe with respect to flushing.
+    #  @param self The object pointer.
+    #  @param participant_id The integer ID of the participant.
+    #  @param coords The participant's 1D, 2D, or 3D coordinates.
+    #  @return Whether or not a participant already in the buffers was moved.
+    def set_coordinates(self, participant_id, coords):
+        self.coordinate_overrides[participant_id] = WaveFields.to_spatial(coords)
+        index = self.id_index_map.get(participant_id)
+        if index is None:
+            return False
+        self.coordinates[index] = self.coordinate_overrides[participant_id]
+        return True
+
+    ## Grow the buffers, doubling their capacity.
+    #  @param self The object pointer.
+    def grow(self):
+        capacity = 2 * len(self.positions)
+        for name in ("participant_ids", "positions", "last_seen", "coordinates"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    ## Remove every participant not seen since the given time, compacting the
+    #  buffers, along with any coordinates set for them.
+    #  @param self The object pointer.
+    #  @param cutoff The monotonic timestamp, in seconds.
+    #  @return The list of ID's of evicted participants.
+    def evict_older_than(self, cutoff):
+        live = self.last_seen[:self.count] >= cutoff
+        live_count = int(np.count_nonzero(live))
+        if live_count == self.count:
+            return []
+        evicted = self.participant_ids[:self.count][~live].tolist()
+        for pid in evicted:
+            self.coordinate_overrides.pop(pid, None)
+        for name in ("participant_ids", "positions", "last_seen", "coordinates"):
+            buf = getattr(self, name)
+            buf[:live_count] = buf[:self.count][live]
+        self.count = live_count
+        self.id_index_map = dict((pid, i) for i, pid in enumerate(self.participant_ids[:self.count].tolist()))
+        return evicted
+
+    ## Apply all queued responses, then evict any participants that timed out.
+    #  @param self The object pointer.
+    #  @param now The current monotonic timestamp, in seconds.
+    #  @return The RegistryFlushResult describing what changed.
+    def flush(self, now):
+        added = []
+        moved = False
+        while self.pending:
+            pid, position, seen = self.pending.popleft()
+            index = self.id_index_map.get(pid)
+            if index is None:
+                if self.count >= len(self.positions):
+                    self.grow()
+                index = self.count
+                self.count += 1
+                self.id_index_map[pid] = index
+                self.participant_ids[index] = pid
+                self.positions[index] = position
+                self.coordinates[index] = self.coordinate_overrides.get(pid, (position, 0.0, 0.0))
+                added.append(pid)
+            elif self.positions[index] != position:
+                self.positions[index] = position
+                if pid not in self.coordinate_overrides:
+                    self.coordinates[index] = (position, 0.0, 0.0)
+                moved = True
+            self.last_seen[index] = seen
+        evicted = self.evict_older_than(now - self.timeout) if (self.timeout > 0) else []
+        if added or evicted:
+            self.participant_ids_list = self.participant_ids[:self.count].tolist()
+        return RegistryFlushResult(added, moved, evicted)
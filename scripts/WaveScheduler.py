@@ -0,0 +1,110 @@
+from time import monotonic
+from threading import Event
+
+from PyQt5.QtCore import QThread
+
+#
+# Class definitions
+#
+
+## Counters describing how closely a periodic scheduler has kept to its deadlines.
+class SchedulerStats(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    def __init__(self):
+        self.tick_count = 0
+        self.missed_tick_count = 0
+        self.failed_tick_count = 0
+        self.total_jitter = 0.0
+        self.max_jitter = 0.0
+
+    ## Record a tick that fired some amount of time after its deadline.
+    #  @param self The object pointer.
+    #  @param lateness The number of seconds the tick fired after its deadline.
+    #  @param missed The number of whole ticks that were skipped to catch up.
+    def record(self, lateness, missed):
+        self.tick_count += 1
+        self.missed_tick_count += missed
+        self.total_jitter += lateness
+        if lateness > self.max_jitter:
+            self.max_jitter = lateness
+
+    ## Get the mean jitter of all ticks so far.
+    #  @param self The object pointer.
+    #  @return The mean jitter, in milliseconds.
+    def mean_jitter_ms(self):
+        return (1000 * self.total_jitter / self.tick_count) if self.tick_count else 0.0
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        return "ticks={0}, missed={1}, failed={2}, mean_jitter={3:.3f}ms, max_jitter={4:.3f}ms".format(
+            self.tick_count,
+            self.missed_tick_count,
+            self.failed_tick_count,
+            self.mean_jitter_ms(),
+            1000 * self.max_jitter
+        )
+
+## A thread that calls a routine at a fixed rate against absolute monotonic
+#  deadlines, so late ticks never accumulate into drift and the Qt main thread
+#  being busy never delays a tick. A tick routine that raises does not stop the
+#  scheduler.
+class WaveScheduler(QThread):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param tick_callback The routine to call each tick, given the monotonic
+    #  timestamp (in seconds) the tick fired at.
+    #  @param period_ms The tick period, in milliseconds.
+    #  @param error_callback The routine to call, given the exception, when a tick
+    #  routine raises after the one before it did not, or null to only count it.
+    #  @param parent This object's optional Qt parent.
+    def __init__(self, tick_callback, period_ms, error_callback=None, parent=None):
+        super(WaveScheduler, self).__init__(parent)
+        self.tick_callback = tick_callback
+        self.error_callback = error_callback
+        self.period = period_ms / 1000
+        self.stop_event = Event()
+        self.stats = SchedulerStats()
+
+    ## Start the scheduler thread. The stop request is reset here rather than on
+    #  the thread, so a stop requested before the thread runs is not lost.
+    #  @param self The object pointer.
+    #  @param args The optional QThread priority.
+    def start(self, *args):
+        self.stop_event.clear()
+        super(WaveScheduler, self).start(*args)
+
+    ## Call the tick routine at every deadline until a stop is requested. If one
+    #  or more deadlines have completely passed, they are counted as missed and
+    #  skipped rather than fired back-to-back.
+    #  @param self The object pointer.
+    def run(self):
+        failing = False
+        next_deadline = monotonic() + self.period
+        while not self.stop_event.is_set():
+            delay = next_deadline - monotonic()
+            if (delay > 0) and self.stop_event.wait(delay):
+                break
+            now = monotonic()
+            lateness = max(now - next_deadline, 0.0)
+            missed = int(lateness // self.period)
+            self.stats.record(lateness, missed)
+            next_deadline += (missed + 1) * self.period
+            try:
+                self.tick_callback(now)
+                failing = False
+            except Exception as e:
+                self.stats.failed_tick_count += 1
+                if (not failing) and (self.error_callback is not None):
+                    self.error_callback(e)
+                failing = True
+
+    ## Blocking call to stop the scheduler.
+    #  @param self The object pointer.
+    def stop(self):
+        self.stop_event.set()
+        self.wait()
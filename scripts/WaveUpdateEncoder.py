@@ -0,0 +1,159 @@
+from array import array
+
+import numpy as np
+
+from sh_common_interfaces.msg import WaveUpdate
+
+#
+# Constants
+#
+
+# The approximate serialized size of one participant ID, in bytes
+WAVE_PARTICIPANT_ID_BYTES = 4
+# The serialized size of one intensity, in bytes
+WAVE_INTENSITY_BYTES = 4
+# The approximate serialized size of a WaveUpdate msg with no participants
+# (the two sequence length prefixes), in bytes
+WAVE_UPDATE_EMPTY_BYTES = 8
+# The number of levels intensities in [-1,1] are quantized to
+QUANTIZATION_LEVELS = 256
+
+#
+# Global functions
+#
+
+## Quantize intensities in [-1,1] to 8-bit levels.
+#  @param intensities The array of intensities.
+#  @return A new array of the quantized intensities.
+def quantize(intensities):
+    half_range = (QUANTIZATION_LEVELS - 1) / 2
+    return (np.rint((np.clip(intensities, -1.0, 1.0) + 1) * half_range) / half_range) - 1
+
+## Get the number of WaveUpdate msgs needed to carry some participants.
+#  @param participant_count The number of participants.
+#  @param shard_size The max number of participants per msg, or zero for no limit.
+#  @return The number of msgs.
+def shard_count(participant_count, shard_size):
+    if (shard_size <= 0) or (participant_count <= shard_size):
+        return 1
+    return -(-participant_count // shard_size)
+
+## Get the approximate serialized size of the WaveUpdate msgs carrying some participants.
+#  @param participant_count The number of participants.
+#  @param shard_size The max number of participants per msg, or zero for no limit.
+#  @return The size, in bytes.
+def wave_update_size(participant_count, shard_size=0):
+    return (WAVE_UPDATE_EMPTY_BYTES * shard_count(participant_count, shard_size)) \
+        + (participant_count * (WAVE_PARTICIPANT_ID_BYTES + WAVE_INTENSITY_BYTES))
+
+## Build a WaveUpdate msg.
+#  @param participant_ids The sequence of participant ID's.
+#  @param intensities The array of intensities, in the same order.
+#  @return The WaveUpdate msg.
+def make_wave_update(participant_ids, intensities):
+    msg = WaveUpdate()
+    msg.participant_ids = participant_ids
+    msg.intensities.data = array("f", intensities.astype(np.float32).tobytes())
+    return msg
+
+## Build the WaveUpdate msgs for some participants, split into shards of at
+#  most a fixed number of participants each.
+#  @param participant_ids The list of participant ID's.
+#  @param intensities The array of intensities, in the same order.
+#  @param shard_size The max number of participants per msg, or zero for no limit.
+#  @return The list of WaveUpdate msgs.
+def make_wave_updates(participant_ids, intensities, shard_size):
+    if shard_count(len(participant_ids), shard_size) == 1:
+        return [make_wave_update(participant_ids, intensities)]
+    return [
+        make_wave_update(participant_ids[i:i + shard_size], intensities[i:i + shard_size])
+        for i in range(0, len(participant_ids), shard_size)
+    ]
+
+#
+# Class definitions
+#
+
+## Turns sampled wave intensities into the WaveUpdate msgs to publish. When delta
+#  publishing is enabled, only participants whose intensity moved more than some
+#  epsilon since it was last sent are included, and frames where nothing moved are
+#  not published at all. A full keyframe is periodically sent, and whenever the
+#  set of participants changes, so late joiners can resync. Large frames are split
+#  into shards so no single msg grows with the number of participants.
+class WaveUpdateEncoder(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param epsilon The minimum change in intensity to send, or zero to always
+    #  send full frames.
+    #  @param keyframe_interval The max number of frames between full keyframes.
+    #  @param quantize Whether or not to quantize intensities to 8-bit levels.
+    #  @param shard_size The max number of participants per msg, or zero for no limit.
+    def __init__(self, epsilon=0.0, keyframe_interval=100, quantize=False, shard_size=0):
+        self.epsilon = epsilon
+        self.keyframe_interval = keyframe_interval
+        self.quantize = quantize
+        self.shard_size = shard_size
+        self.last_ids = None
+        self.last_intensities = None
+        self.frames_since_keyframe = 0
+        self.messages_sent = 0
+        self.messages_saved = 0
+        self.bytes_sent = 0
+        self.bytes_saved = 0
+
+    ## Encode the latest sampled intensities.
+    #  @param self The object pointer.
+    #  @param ids_list The list of participant ID's, which is expected to be a
+    #  new object whenever the set of participants changes.
+    #  @param ids The array of participant ID's, in the same order.
+    #  @param intensities The array of intensities, in the same order.
+    #  @return The list of WaveUpdate msgs to publish, empty if nothing needs to be sent.
+    def encode(self, ids_list, ids, intensities):
+        if self.quantize:
+            intensities = quantize(intensities)
+        full_size = wave_update_size(len(ids_list), self.shard_size)
+
+        # Send everything if delta publishing is disabled or a keyframe is due
+        if (
+            (self.epsilon <= 0)
+            or (ids_list is not self.last_ids)
+            or (self.frames_since_keyframe + 1 >= self.keyframe_interval)
+        ):
+            self.last_ids = ids_list
+            self.last_intensities = np.array(intensities, dtype=np.float64)
+            self.frames_since_keyframe = 0
+            msgs = make_wave_updates(ids_list, intensities, self.shard_size)
+            self.messages_sent += len(msgs)
+            self.bytes_sent += full_size
+            return msgs
+
+        # Otherwise, send only the participants that moved enough
+        self.frames_since_keyframe += 1
+        changed = np.abs(intensities - self.last_intensities) > self.epsilon
+        changed_count = int(np.count_nonzero(changed))
+        full_count = shard_count(len(ids_list), self.shard_size)
+        if 0 == changed_count:
+            self.messages_saved += full_count
+            self.bytes_saved += full_size
+            return []
+        changed_intensities = intensities[changed]
+        self.last_intensities[changed] = changed_intensities
+        delta_size = wave_update_size(changed_count, self.shard_size)
+        msgs = make_wave_updates(ids[changed].tolist(), changed_intensities, self.shard_size)
+        self.messages_sent += len(msgs)
+        self.messages_saved += full_count - len(msgs)
+        self.bytes_sent += delta_size
+        self.bytes_saved += full_size - delta_size
+        return msgs
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        return "messages_sent={0}, messages_saved={1}, bytes_sent={2}, bytes_saved={3}".format(
+            self.messages_sent,
+            self.messages_saved,
+            self.bytes_sent,
+            self.bytes_saved
+        )
@@ -0,0 +1,148 @@
+from math import pi
+
+import numpy as np
+
+#
+# Constants
+#
+
+_2PI = 2 * pi
+
+# The number of samples in one revolution of a waveform table, must be a power of two
+WAVEFORM_TABLE_RESOLUTION = 1024
+
+# The names of the builtin waveform shapes
+SINE = "sine"
+TRIANGLE = "triangle"
+GAUSSIAN_PULSE = "gaussian_pulse"
+CHASE = "chase"
+CUSTOM = "custom"
+
+# The default fraction of a revolution covered by pulse-like shapes
+DEFAULT_PULSE_WIDTH = 0.1
+
+#
+# Global functions
+#
+
+## Get the phase, as a fraction of a revolution in [0,1), of each table sample.
+#  @param resolution The number of samples in the table.
+#  @return The array of fractional phases.
+def sample_fractions(resolution):
+    return np.arange(resolution, dtype=np.float64) / resolution
+
+## Get the distance, as a fraction of a revolution in [0,0.5], from each table
+#  sample to the wave's peak at phase zero.
+#  @param resolution The number of samples in the table.
+#  @return The array of distances.
+def distances_from_peak(resolution):
+    x = sample_fractions(resolution)
+    return np.minimum(x, 1 - x)
+
+## Build a cosine table, peaking at 1 at phase zero and reaching -1 halfway through.
+#  @param resolution The number of samples in the table.
+#  @param width Unused, accepted for a uniform signature.
+#  @return The table of intensities.
+def build_sine_table(resolution, width=None):
+    return np.cos(sample_fractions(resolution) * _2PI)
+
+## Build a triangle table, matching the cosine table at its peaks and troughs.
+#  @param resolution The number of samples in the table.
+#  @param width Unused, accepted for a uniform signature.
+#  @return The table of intensities.
+def build_triangle_table(resolution, width=None):
+    return 1 - (4 * distances_from_peak(resolution))
+
+## Build a table with a single Gaussian pulse centered on phase zero.
+#  @param resolution The number of samples in the table.
+#  @param width The standard deviation of the pulse, as a fraction of a revolution.
+#  @return The table of intensities.
+def build_gaussian_pulse_table(resolution, width=DEFAULT_PULSE_WIDTH):
+    return np.exp(-0.5 * np.square(distances_from_peak(resolution) / width))
+
+## Build a table that is fully on within a window around phase zero and off elsewhere.
+#  @param resolution The number of samples in the table.
+#  @param width The fraction of a revolution that is on.
+#  @return The table of intensities.
+def build_chase_table(resolution, width=DEFAULT_PULSE_WIDTH):
+    return (distances_from_peak(resolution) <= (width / 2)).astype(np.float64)
+
+## Build a table from a user-defined shape.
+#  @param resolution The number of samples in the table.
+#  @param shape Either a function mapping an array of phases in [0,2pi) to
+#  intensities, or a sequence of intensities evenly spaced over one revolution
+#  which is linearly resampled (wrapping around) to the table's resolution.
+#  @return The table of intensities.
+def build_custom_table(resolution, shape):
+    if callable(shape):
+        return np.broadcast_to(
+            np.asarray(shape(sample_fractions(resolution) * _2PI), dtype=np.float64),
+            (resolution,)
+        ).copy()
+    samples = np.asarray(shape, dtype=np.float64)
+    count = len(samples)
+    return np.interp(
+        sample_fractions(resolution) * count,
+        np.arange(count + 1),
+        np.append(samples, samples[0])
+    )
+
+#
+# Class definitions
+#
+
+## A waveform precomputed into a fixed-resolution lookup table over one revolution.
+class WaveformTable(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param name The name of the waveform's shape.
+    #  @param table The array of intensities.
+    #  @param width The width the shape was built with, if any.
+    def __init__(self, name, table, width=None):
+        resolution = len(table)
+        assert (resolution > 0) and (0 == (resolution & (resolution - 1))), \
+            "Waveform table resolution must be a power of two: {0}".format(resolution)
+        self.name = name
+        self.width = width
+        self.table = np.ascontiguousarray(table, dtype=np.float64)
+        self.resolution = resolution
+        self.mask = resolution - 1
+
+    ## Convert a location, in radians, to an index into the table.
+    #  @param self The object pointer.
+    #  @param location The location, in radians.
+    #  @return The index of the nearest table sample.
+    def index_of(self, location):
+        return int(round((location / _2PI) * self.resolution)) & self.mask
+
+    ## Convert an array of locations, in radians, to table indices.
+    #  @param self The object pointer.
+    #  @param locations The array of locations, in radians.
+    #  @return The array of indices of the nearest table samples.
+    def indices_of(self, locations):
+        return np.bitwise_and(
+            np.rint(np.asarray(locations) * (self.resolution / _2PI)).astype(np.int64),
+            self.mask
+        )
+
+## The functions to build each builtin waveform shape's table.
+WAVEFORM_BUILDERS = {
+    SINE: build_sine_table,
+    TRIANGLE: build_triangle_table,
+    GAUSSIAN_PULSE: build_gaussian_pulse_table,
+    CHASE: build_chase_table,
+}
+
+## Build a waveform lookup table.
+#  @param waveform The name of a builtin shape, or a user-defined shape (see
+#  build_custom_table).
+#  @param resolution The number of samples in the table.
+#  @param width The width of pulse-like shapes, as a fraction of a revolution.
+#  @return The WaveformTable.
+def build_waveform_table(waveform, resolution=WAVEFORM_TABLE_RESOLUTION, width=DEFAULT_PULSE_WIDTH):
+    if isinstance(waveform, str):
+        builder = WAVEFORM_BUILDERS.get(waveform)
+        assert builder is not None, "Unknown waveform: '{0}'".format(waveform)
+        return WaveformTable(waveform, builder(resolution, width), width)
+    return WaveformTable(CUSTOM, build_custom_table(resolution, waveform))
@@ -0,0 +1,364 @@
+from time import monotonic, sleep
+from threading import Lock
+from collections import OrderedDict
+
+from youtubesearchpython import VideosSearch
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from scripts import GuiUtils
+
+#
+# Constants
+#
+
+# Search YouTube itself
+YOUTUBE_SEARCH_BACKEND_YOUTUBE = "youtube"
+# Search a local stand-in that needs no network, for testing offline
+YOUTUBE_SEARCH_BACKEND_LOCAL = "local"
+
+# The max number of searches running at once; any beyond this are queued, and
+# skipped once they are superseded
+YOUTUBE_SEARCH_THREAD_COUNT = 2
+
+# The max number of queries whose results are cached
+YOUTUBE_SEARCH_CACHE_CAPACITY = 64
+
+# The number of result pages the local stand-in backend makes up per query
+LOCAL_SEARCH_PAGE_COUNT = 5
+
+#
+# Global functions
+#
+
+## Normalize a search query, so that queries differing only in case or spacing
+#  share cached results.
+#  @param query The search text.
+#  @return The normalized search text.
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+#
+# Class definitions
+#
+
+## Searches YouTube through youtube-search-python.
+class YouTubeSearchBackend(object):
+
+    ## Search for videos, a page at a time. Each page blocks for a network round
+    #  trip, the first for the search itself and the rest for its continuations.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @param limit The max number of results per page.
+    #  @return A generator of pages, each an iterable of result dicts as described
+    #  by youtube-search-python.
+    def pages(self, query, limit):
+        search = VideosSearch(query, limit=limit)
+        yield search.result()["result"]
+        while search.next():
+            yield search.result()["result"]
+
+## A local stand-in for YouTubeSearchBackend that makes up pages of results
+#  shaped like the real ones, after an injectable delay, with a local thumbnail
+#  image.
+class LocalSearchBackend(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param latency_ms How long each page takes before its first result.
+    #  @param result_latency_ms How long each result after the first takes.
+    #  @param page_count The number of pages per query.
+    def __init__(self, latency_ms=500, result_latency_ms=0, page_count=LOCAL_SEARCH_PAGE_COUNT):
+        self.latency_ms = latency_ms
+        self.result_latency_ms = result_latency_ms
+        self.page_count = page_count
+
+    ## Make up the result dict for a query.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @param n The index of the result.
+    #  @return The result dict.
+    def make_result(self, query, n):
+        video_id = "local-{0}-{1}".format(abs(hash(query)) % 1000000, n)
+        return {
+            "id": video_id,
+            "title": "{0} #{1}".format(query, n + 1),
+            "duration": "{0}:{1:02d}".format(3 + (n % 4), (7 * n) % 60),
+            "channel": {"name": "Local Channel"},
+            "viewCount": {"short": "{0}K views".format(n + 1)},
+            "thumbnails": [{"url": "file://" + GuiUtils.get_image_url("search_youtube.png")}],
+            "link": "https://www.youtube.com/watch?v=" + video_id,
+        }
+
+    ## Make up one page of results, yielding each after its delay.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @param limit The number of results per page.
+    #  @param page The index of the page.
+    #  @return A generator of result dicts.
+    def page(self, query, limit, page):
+        sleep(self.latency_ms / 1000)
+        for n in range(limit):
+            if n and self.result_latency_ms:
+                sleep(self.result_latency_ms / 1000)
+            yield self.make_result(query, (page * limit) + n)
+
+    ## Search for videos, a page at a time.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @param limit The number of results per page.
+    #  @return A generator of pages, each a generator of result dicts.
+    def pages(self, query, limit):
+        for page in range(self.page_count):
+            yield self.page(query, limit, page)
+
+## The pages of one query cached so far by a CachingSearchBackend, along with
+#  the continuation to fetch any more from. Pages are fetched on demand, by
+#  whichever search reaches the end of the cached ones first.
+class CachedSearch(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param continuation The generator of pages from the uncached backend.
+    def __init__(self, continuation):
+        self.lock = Lock()
+        self.pages = []
+        self.continuation = continuation
+
+    ## Get a page, fetching it, and any before it, if needed.
+    #  @param self The object pointer.
+    #  @param n The index of the page.
+    #  @return The list of result dicts, or null if there is no such page.
+    def page(self, n):
+        with self.lock:
+            while (len(self.pages) <= n) and (self.continuation is not None):
+                try:
+                    self.pages.append(list(next(self.continuation)))
+                except StopIteration:
+                    self.continuation = None
+            return self.pages[n] if (n < len(self.pages)) else None
+
+## A memoizing layer in front of another search backend. Each normalized query's
+#  pages are kept for a limited time from when it was first searched, and the
+#  least recently used queries are dropped beyond a set number. Searches for a
+#  cached query share its pages, and its continuation for any more. It is safe
+#  to use from any thread.
+class CachingSearchBackend(object):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param backend The search backend to cache the results of.
+    #  @param ttl_s How long results stay cached, in seconds.
+    #  @param capacity The max number of queries to cache.
+    def __init__(self, backend, ttl_s, capacity=YOUTUBE_SEARCH_CACHE_CAPACITY):
+        self.backend = backend
+        self.ttl_s = ttl_s
+        self.capacity = capacity
+        self.lock = Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    ## Get the cached search of a normalized query. Must be called with the lock
+    #  held.
+    #  @param self The object pointer.
+    #  @param key The normalized search text.
+    #  @param now The current monotonic time.
+    #  @return The CachedSearch, or null if not cached or expired.
+    def lookup(self, key, now):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expiry, cached = entry
+        if now >= expiry:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return cached
+
+    ## Drop a cached search, e.g. after it failed, unless it was already replaced.
+    #  @param self The object pointer.
+    #  @param key The normalized search text.
+    #  @param cached The CachedSearch.
+    def discard(self, key, cached):
+        with self.lock:
+            entry = self.entries.get(key)
+            if (entry is not None) and (entry[1] is cached):
+                del self.entries[key]
+
+    ## Search for videos, a page at a time, from the cache if possible. Pages
+    #  fetched from the backend are cached whole.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @param limit The max number of results per page.
+    #  @return A generator of pages, each a list of result dicts.
+    def pages(self, query, limit):
+        key = normalize_query(query)
+        with self.lock:
+            cached = self.lookup(key, monotonic())
+            if cached is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                cached = CachedSearch(self.backend.pages(query, limit))
+                self.entries[key] = (monotonic() + self.ttl_s, cached)
+                while len(self.entries) > self.capacity:
+                    self.entries.popitem(last=False)
+        n = 0
+        while True:
+            try:
+                page = cached.page(n)
+            except Exception:
+                self.discard(key, cached)
+                raise
+            if page is None:
+                return
+            yield page
+            n += 1
+
+    ## Get the cached first page of the longest query that the given query
+    #  starts with, e.g. to show while the full query is being searched.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @return The list of result dicts, or null if no such query is cached.
+    def cached_prefix_results(self, query):
+        key = normalize_query(query)
+        now = monotonic()
+        with self.lock:
+            for n in range(len(key), 0, -1):
+                cached = self.lookup(key[:n].rstrip(), now)
+                if (cached is not None) and cached.pages:
+                    return list(cached.pages[0])
+        return None
+
+    ## Get a human-readable summary of the counters.
+    #  @param self The object pointer.
+    #  @return The summary string.
+    def summary(self):
+        with self.lock:
+            return "hits={0}, misses={1}, queries={2}".format(self.hits, self.misses, len(self.entries))
+
+## A task to fetch the next page of a search on a pool thread, handing back each
+#  result as it arrives until the search is superseded.
+class YouTubeSearchPageTask(QRunnable):
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param searcher The YouTubeSearcher to report results to.
+    #  @param search_id The ID of the search.
+    #  @param pages The search's generator of pages.
+    def __init__(self, searcher, search_id, pages):
+        super(YouTubeSearchPageTask, self).__init__()
+        self.searcher = searcher
+        self.search_id = search_id
+        self.pages = pages
+
+    ## Fetch the page, stopping early if the search is superseded.
+    #  @param self The object pointer.
+    def run(self):
+        if not self.searcher.is_current(self.search_id): return
+        error = ""
+        has_more = True
+        try:
+            for result in next(self.pages):
+                if not self.searcher.is_current(self.search_id): return
+                self.searcher.result_found.emit(self.search_id, result)
+        except StopIteration:
+            has_more = False
+        except Exception as e:
+            error = str(e) or type(e).__name__
+            has_more = False
+        self.searcher.fetched_page.emit(self.search_id, error, has_more)
+
+## Runs YouTube searches off the Qt main thread, a page at a time: a search
+#  fetches its first page right away, and each further page only when asked
+#  for. Each new search supersedes the one before it: a superseded search stops
+#  at its next result, or is never started if still queued, and anything it
+#  already handed back is ignored. The network request of a page already
+#  underway cannot be interrupted, but its results are dropped.
+class YouTubeSearcher(QObject):
+
+    #
+    # Qt Signal(s)
+    #
+
+    ## Emits each result of the current search, with its search ID, as it arrives
+    result_found = pyqtSignal(int, dict)
+    ## Emits a finished page's search ID, error message, and whether there may be
+    #  more pages, from a pool thread
+    fetched_page = pyqtSignal(int, str, bool)
+    ## Emits the ID of the current search once a page of it is done, with an
+    #  error message if it failed, and whether there may be more pages
+    page_finished = pyqtSignal(int, str, bool)
+
+    ## The constructor.
+    #  @param self The object pointer.
+    #  @param backend The search backend, which may be replaced at any time.
+    #  @param parent This object's optional Qt parent.
+    def __init__(self, backend=None, parent=None):
+        super(YouTubeSearcher, self).__init__(parent)
+        self.backend = backend if (backend is not None) else YouTubeSearchBackend()
+        self.lock = Lock()
+        self.search_id = 0
+        # The current search's generator of pages, only touched on this object's
+        # thread or by the one page task in flight
+        self.pages = None
+        self.page_in_flight = False
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(YOUTUBE_SEARCH_THREAD_COUNT)
+        # Make Qt connections
+        self.fetched_page.connect(self.handle_fetched_page)
+
+    ## Check whether a search is still the current one. This is safe to call from
+    #  any thread.
+    #  @param self The object pointer.
+    #  @param search_id The ID of the search.
+    #  @return Whether or not the search has not been superseded.
+    def is_current(self, search_id):
+        with self.lock:
+            return search_id == self.search_id
+
+    ## Start a search, superseding any in flight, and fetch its first page.
+    #  @param self The object pointer.
+    #  @param query The search text.
+    #  @return The ID of the new search.
+    def search(self, query):
+        with self.lock:
+            self.search_id += 1
+            search_id = self.search_id
+        self.pages = self.backend.pages(query, GuiUtils.YOUTUBE_SEARCH_RESULT_COUNT)
+        self.page_in_flight = False
+        self.fetch_next_page()
+        return search_id
+
+    ## Fetch the current search's next page, unless one is already being fetched
+    #  or there are no more.
+    #  @param self The object pointer.
+    #  @return Whether or not a page fetch was started.
+    def fetch_next_page(self):
+        if (self.pages is None) or self.page_in_flight: return False
+        self.page_in_flight = True
+        with self.lock:
+            search_id = self.search_id
+        self.thread_pool.start(YouTubeSearchPageTask(self, search_id, self.pages))
+        return True
+
+    ## Hand off a finished page of the current search.
+    #  @param self The object pointer.
+    #  @param search_id The ID of the search the page belongs to.
+    #  @param error The error message, empty if the page was fetched.
+    #  @param has_more Whether there may be more pages.
+    def handle_fetched_page(self, search_id, error, has_more):
+        if not self.is_current(search_id): return
+        self.page_in_flight = False
+        if not has_more:
+            self.pages = None
+        self.page_finished.emit(search_id, error, has_more)
+
+    ## Supersede any search in flight without starting another.
+    #  @param self The object pointer.
+    def cancel(self):
+        with self.lock:
+            self.search_id += 1
+        self.pages = None
+        self.page_in_flight = False
@@ -1,14 +1,21 @@
-from urllib.request import urlopen
-
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QWidget
 from PyQt5.QtGui import QPixmap
 
+from scripts import GuiUtils
+from scripts.ThumbnailLoader import ThumbnailLoader
 from scripts.Ui_YouTubeVideoListing import Ui_YouTubeVideoListing
 
 ## A widget for a simple visualization of a YouTube video.
 class YouTubeVideoListing(QWidget):
 
+    #
+    # Qt Signal(s)
+    #
+
+    ## Emits once the thumbnail has been loaded, or has failed to load
+    thumbnail_loaded = pyqtSignal()
+
     ## The constructor.
     #  @param self The object pointer.
     #  @param parent This object's optional Qt parent.
@@ -21,11 +28,13 @@ class YouTubeVideoListing(QWidget):
 
         # Initialize video content to null
         self.result_dict = None
+        self.thumbnail_key = None
 
         # Done
         self.show()
 
-    ## Populate the widgets given data on the YouTube video.
+    ## Populate the widgets given data on the YouTube video. The thumbnail shows
+    #  a placeholder until it has been loaded in the background.
     #  @param self The object pointer.
     #  @param result_dict Properties of the YouTube video.
     def populate(self, result_dict):
@@ -36,10 +45,15 @@ class YouTubeVideoListing(QWidget):
         # Populate the UI skeleton given the data in the results dictionary
         #
 
-        # Set the thumbnail image
-        thumbnail_pixmap = QPixmap()
-        thumbnail_pixmap.loadFromData(urlopen(self.result_dict["thumbnails"][0]["url"]).read())
-        self.ui.thumbnail.setPixmap(thumbnail_pixmap.scaledToHeight(150, Qt.SmoothTransformation))
+        # Set the thumbnail placeholder and start loading the thumbnail image
+        self.ui.thumbnail.setPixmap(GuiUtils.SWATCH_CACHE.get((
+            GuiUtils.YOUTUBE_THUMBNAIL_PLACEHOLDER_WIDTH,
+            GuiUtils.YOUTUBE_THUMBNAIL_HEIGHT,
+            GuiUtils.YOUTUBE_THUMBNAIL_PLACEHOLDER_GRAY,
+            GuiUtils.YOUTUBE_THUMBNAIL_PLACEHOLDER_GRAY,
+            GuiUtils.YOUTUBE_THUMBNAIL_PLACEHOLDER_GRAY
+        )))
+        self.load_thumbnail(self.result_dict["thumbnails"][0]["url"], self.result_dict["id"])
 
         # Set the title, author, duration, and view count
         self.ui.duration.setText(self.result_dict["duration"])
@@ -51,6 +65,30 @@ class YouTubeVideoListing(QWidget):
         for i in range(2, self.ui.overall_layout.columnCount()):
             self.ui.overall_layout.setColumnStretch(i, 1)
 
+    ## Start loading the thumbnail image through the shared ThumbnailLoader.
+    #  @param self The object pointer.
+    #  @param url The URL of the thumbnail image.
+    #  @param key The cache key of the thumbnail image, e.g. the video's ID.
+    def load_thumbnail(self, url, key):
+        loader = ThumbnailLoader.instance()
+        if self.thumbnail_key is None:
+            loader.thumbnail_ready.connect(self.set_thumbnail)
+        self.thumbnail_key = key or url
+        loader.load(url, self.thumbnail_key)
+
+    ## Show the thumbnail image once it has been loaded, keeping the placeholder
+    #  if it failed to load.
+    #  @param self The object pointer.
+    #  @param key The cache key of the loaded thumbnail image.
+    #  @param qimg The display-ready thumbnail, null if it failed to load.
+    def set_thumbnail(self, key, qimg):
+        if key != self.thumbnail_key: return
+        ThumbnailLoader.instance().thumbnail_ready.disconnect(self.set_thumbnail)
+        self.thumbnail_key = None
+        if not qimg.isNull():
+            self.ui.thumbnail.setPixmap(QPixmap.fromImage(qimg))
+        self.thumbnail_loaded.emit()
+
     ## Getter for the video's unique ID, returns null if a video is not set.
     #  @param self The object pointer.
     #  @return The video's unique ID.